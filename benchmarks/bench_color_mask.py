@@ -0,0 +1,56 @@
+# benchmarks/bench_color_mask.py
+"""
+Compare the Canny and HLS color mask edge methods on the sample video
+frames and images: time of the edge, ROI and lane stages, Hough segments
+and missed lines.
+
+Run from the repository root: ``python -m benchmarks.bench_color_mask``
+"""
+
+from benchmarks.common import load_config_params, report, sample_images, \
+    sample_videos
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.core.enums import EdgeMethod
+from pixelx.visionx_lib.lane.detection import detect_image
+
+
+def load_frames() -> list[np.ndarray]:
+    """Return the frames of the sample videos and the sample images."""
+    frames = []
+    for video_path in sample_videos():
+        capture = cv2.VideoCapture(video_path)
+        while True:
+            success, frame = capture.read()
+            if not success:
+                break
+            frames.append(frame)
+        capture.release()
+    return frames + [cv2.imread(path) for path in sample_images()]
+
+
+def main() -> None:
+    config_params = load_config_params()
+    frames = load_frames()
+    rows = [("method", "edges (ms)", "roi (ms)", "lane (ms)", "total (ms)",
+             "segments", "fails L/R")]
+
+    for method in EdgeMethod:
+        edge_config = {**config_params[1], "method": method.value}
+        params = (config_params[0], edge_config, *config_params[2:])
+        results = [detect_image(frame, params)[2] for frame in frames]
+        timings = {stage: np.mean([result["timings"][stage]
+                                   for result in results])
+                   for stage in ("edges", "roi", "lane", "total")}
+        rows.append((
+            method.value,
+            *(f"{timings[stage]:.2f}" for stage in timings),
+            f"{np.mean([result['segments'] for result in results]):.1f}",
+            "/".join(str(sum(result[f"{side}_line"] is None
+                             for result in results))
+                     for side in ("left", "right"))))
+
+    report(f"Edge methods on {len(frames)} frames", rows)
+
+
+if __name__ == "__main__":
+    main()
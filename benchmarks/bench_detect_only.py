@@ -0,0 +1,53 @@
+# benchmarks/bench_detect_only.py
+"""
+Compare the full render path of the video pipeline against detect-only.
+
+Run from the repository root: ``python -m benchmarks.bench_detect_only``
+"""
+
+import tempfile
+
+from benchmarks.common import load_config_params, report, sample_videos, \
+    time_call
+from pixelx.visionx_lib.core.base import os
+from pixelx.visionx_lib.core.enums import VideoCodec
+from pixelx.visionx_lib.lane.detection import process_frame, detect_frame
+from pixelx.visionx_lib.video.io import open_video_capture, \
+    get_frame_dimensions, get_frame_rate, save_video_file
+from pixelx.visionx_lib.video.processing import process_video
+
+
+def run_full_render(video_path: str, config_params: tuple[dict, ...],
+                    output_path: str) -> None:
+    capture = open_video_capture(video_path)
+    fps, frame_size = get_frame_rate(capture), get_frame_dimensions(capture)
+    frames = process_video(capture, process_frame, config_params,
+                           results=[])
+    save_video_file(frames, output_path, fps, frame_size, VideoCodec.MP4V)
+
+
+def run_detect_only(video_path: str, config_params: tuple[dict, ...]) -> None:
+    capture = open_video_capture(video_path)
+    process_video(capture, detect_frame, config_params, results=[],
+                  detect_only=True)
+
+
+def main() -> None:
+    config_params = load_config_params()
+    rows = [("video", "render (ms)", "detect (ms)", "speedup")]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for video_path in sample_videos():
+            output_path = os.path.join(output_dir, "out.mp4")
+            render_ms = time_call(lambda: run_full_render(
+                video_path, config_params, output_path), repeat=3)
+            detect_ms = time_call(lambda: run_detect_only(
+                video_path, config_params), repeat=3)
+            rows.append((os.path.basename(video_path), f"{render_ms:.1f}",
+                         f"{detect_ms:.1f}", f"{render_ms / detect_ms:.2f}x"))
+
+    report("Full render vs detect-only", rows)
+
+
+if __name__ == "__main__":
+    main()
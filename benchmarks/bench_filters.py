@@ -0,0 +1,57 @@
+# benchmarks/bench_filters.py
+"""
+Time the dense, box, separable and DFT strategies of ``filter_2d``
+across kernel sizes, to locate the crossover points used by the
+automatic method selection.
+
+Run from the repository root: ``python -m benchmarks.bench_filters``
+"""
+
+from benchmarks.common import report, sample_images, time_call
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.core.enums import FilterMethod
+from pixelx.visionx_lib.image.filters import filter_2d, \
+    select_filter_method
+
+KERNEL_SIZES = (3, 5, 9, 15, 25, 41, 65, 101, 151, 201, 251)
+FRAME_SIZE = (1920, 1080)
+
+
+def make_kernels(size: int) -> dict[str, np.ndarray]:
+    gaussian = cv2.getGaussianKernel(size, 0)
+    dense = np.random.default_rng(size).random((size, size))
+    return {
+        "box": np.full((size, size), 1 / size ** 2, np.float32),
+        "gaussian": (gaussian @ gaussian.T).astype(np.float32),
+        "dense": (dense / dense.sum()).astype(np.float32)
+    }
+
+
+def time_method(image: np.ndarray, kernel: np.ndarray,
+                method: FilterMethod) -> str:
+    try:
+        return f"{time_call(lambda: filter_2d(image, kernel, method), 3):.1f}"
+    except ValueError:
+        return "-"  # The kernel does not support this method
+
+
+def main() -> None:
+    image = cv2.resize(cv2.imread(sample_images()[0]), FRAME_SIZE)
+    rows = [("kernel", "dense (ms)", "box (ms)", "sep (ms)",
+             "dft (ms)", "auto")]
+
+    for size in KERNEL_SIZES:
+        for name, kernel in make_kernels(size).items():
+            rows.append((
+                f"{name} {size}x{size}",
+                *(time_method(image, kernel, method) for method in
+                  (FilterMethod.DENSE, FilterMethod.BOX,
+                   FilterMethod.SEPARABLE, FilterMethod.DFT)),
+                select_filter_method(kernel).value))
+
+    report(f"filter_2d strategies on {FRAME_SIZE[0]}x{FRAME_SIZE[1]} BGR",
+           rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_hough.py
+"""
+Compare the probabilistic, angle-restricted (banded) and LSD segment
+detectors on the frames of the sample videos: time per frame of the
+detector alone and of the whole lane stage, and how the fitted lines
+differ from those of the probabilistic Hough transform, at the
+configured width and at 1.5x that width.
+
+Run from the repository root: ``python -m benchmarks.bench_hough``
+"""
+
+import time
+
+from benchmarks.common import load_config_params, report, sample_videos
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.core.enums import HoughMethod
+from pixelx.visionx_lib.image import apply_detect_hough_lines, \
+    apply_detect_hough_lines_banded, apply_detect_lsd_lines
+from pixelx.visionx_lib.lane.detection import preprocess_image, \
+    detect_edges, roi_mask, detect_lane, scale_config_params
+
+SCALES = (1.0, 1.5)
+
+
+def load_masked_edges(config_params: tuple[dict, ...]) -> list[tuple]:
+    """Return the resized frames and masked edges of the sample videos."""
+    preprocess_config, edge_config, mask_config, _, _ = config_params
+    frames = []
+    for video_path in sample_videos():
+        capture = cv2.VideoCapture(video_path)
+        while True:
+            success, frame = capture.read()
+            if not success:
+                break
+            _, grayscale, resized = preprocess_image(frame,
+                                                     **preprocess_config)
+            edges = detect_edges(grayscale, **edge_config)
+            frames.append((resized, roi_mask(edges, **mask_config)))
+        capture.release()
+    return frames
+
+
+def mean_ms(function: callable, items: list) -> float:
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - start) * 1000 / len(items)
+
+
+def line_error(lines: list, reference: list) -> str:
+    """Mean horizontal distance of the line endpoints to the reference."""
+    errors = [np.abs(np.subtract(line, expected)[[0, 2]]).mean()
+              for line, expected in zip(lines, reference)
+              if line is not None and expected is not None]
+    return f"{np.mean(errors):.2f}" if errors else "-"
+
+
+def compare_detectors(config_params: tuple[dict, ...]) -> None:
+    detect_config = config_params[3]
+    frames = load_masked_edges(config_params)
+    edges = [masked for _, masked in frames]
+
+    detectors = {
+        HoughMethod.PROBABILISTIC: lambda image: apply_detect_hough_lines(
+            image, detect_config["rho"], detect_config["theta_degrees"],
+            detect_config["threshold"], detect_config["min_line_length"],
+            detect_config["max_line_gap"]),
+        HoughMethod.BANDED: lambda image: apply_detect_hough_lines_banded(
+            image, detect_config["rho"], detect_config["theta_degrees"],
+            detect_config["threshold"], detect_config["min_line_length"],
+            detect_config["max_line_gap"], detect_config["slope_threshold"]),
+        HoughMethod.LSD: lambda image: apply_detect_lsd_lines(
+            image, detect_config["min_line_length"])
+    }
+
+    results = {}
+    rows = [("method", "detect (ms)", "lane (ms)", "segments",
+             "fails L/R", "err L (px)", "err R (px)")]
+    for method, detector in detectors.items():
+        config = {**detect_config, "hough_method": method.value}
+        detector_ms = mean_ms(detector, edges)
+        lane_ms = mean_ms(lambda frame: detect_lane(*frame, **config),
+                          frames)
+        results[method] = [detect_lane(*frame, **config) for frame in frames]
+
+        reference = results[HoughMethod.PROBABILISTIC]
+        lines = {side: [result[f"{side}_line"] for result in results[method]]
+                 for side in ("left", "right")}
+        expected = {side: [result[f"{side}_line"] for result in reference]
+                    for side in ("left", "right")}
+        rows.append((
+            method.value, f"{detector_ms:.2f}", f"{lane_ms:.2f}",
+            f"{np.mean([result['segments'] for result in results[method]]):.1f}",
+            "/".join(str(sum(line is None for line in lines[side]))
+                     for side in ("left", "right")),
+            line_error(lines["left"], expected["left"]),
+            line_error(lines["right"], expected["right"])))
+
+    height, width = frames[0][1].shape
+    report(f"Segment detectors on {len(frames)} frames at {width}x{height}",
+           rows)
+
+
+def main() -> None:
+    config_params = load_config_params()
+    for scale in SCALES:
+        compare_detectors(scale_config_params(config_params, scale))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_lut.py
+"""
+Compare lookup tables with direct arithmetic for intensity transforms on
+the sample images: gamma, a composed chain of point operations, a binary
+threshold and blending with a constant.
+
+Run from the repository root: ``python -m benchmarks.bench_lut``
+"""
+
+from benchmarks.common import report, sample_images, time_call
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.image.lut import apply_lut, apply_point_operations, \
+    blend_constant_lut, gamma_lut, threshold_lut
+
+GAMMA = 1.5
+CHAIN = [["gamma", GAMMA], ["contrast", 1.2, -10], ["threshold", 120, 255]]
+
+
+def gamma_numpy(image: np.ndarray) -> np.ndarray:
+    """Return the gamma correction of an image computed in floats."""
+    return np.clip(np.rint(255 * (image / 255) ** (1 / GAMMA)),
+                   0, 255).astype(np.uint8)
+
+
+def chain_sequential(image: np.ndarray) -> np.ndarray:
+    """Return the ``CHAIN`` operations applied one after another."""
+    image = cv2.convertScaleAbs(gamma_numpy(image), alpha=1.2, beta=-10)
+    return cv2.threshold(image, 120, 255, cv2.THRESH_BINARY)[1]
+
+
+def main() -> None:
+    images = [cv2.imread(path) for path in sample_images()]
+    grayscale = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) for image in images]
+    zeros = [np.zeros_like(image) for image in images]
+
+    cases = [
+        ("gamma", lambda: [gamma_numpy(image) for image in grayscale],
+         lambda: [apply_lut(image, gamma_lut(GAMMA))
+                  for image in grayscale]),
+        ("gamma, contrast, threshold",
+         lambda: [chain_sequential(image) for image in grayscale],
+         lambda: [apply_point_operations(image, CHAIN)
+                  for image in grayscale]),
+        ("threshold",
+         lambda: [cv2.threshold(image, 120, 255, cv2.THRESH_BINARY)[1]
+                  for image in grayscale],
+         lambda: [apply_lut(image, threshold_lut(120, 255))
+                  for image in grayscale]),
+        ("blend with constant",
+         lambda: [cv2.addWeighted(image, 1, zero, 1, 1)
+                  for image, zero in zip(images, zeros)],
+         lambda: [apply_lut(image, blend_constant_lut(1, 0, 1, 1))
+                  for image in images])
+    ]
+
+    rows = [("operation", "direct (ms)", "lut (ms)")]
+    for name, direct, lut in cases:
+        rows.append((name, *(f"{time_call(function) / len(images):.2f}"
+                             for function in (direct, lut))))
+
+    report(f"Point operations on {len(images)} images", rows)
+
+
+if __name__ == "__main__":
+    main()
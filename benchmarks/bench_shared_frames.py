@@ -0,0 +1,67 @@
+# benchmarks/bench_shared_frames.py
+"""
+Compare pickled frame transfer to a process pool against the shared
+memory frame ring, for a light per-frame function and for lane detection.
+
+Run from the repository root: ``python -m benchmarks.bench_shared_frames``
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.common import load_config_params, report, sample_images, \
+    time_call
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.core.shared_frames import SharedFrameExecutor
+from pixelx.visionx_lib.lane.detection import process_frame
+
+FRAME_COUNT = 64
+WORKERS = 4
+FRAME_SIZES = {"720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def invert_frame(frame: np.ndarray) -> np.ndarray:
+    return cv2.bitwise_not(frame)
+
+
+def run_pickled(executor: ProcessPoolExecutor, function: callable,
+                frames: list[np.ndarray], *args) -> None:
+    for _ in executor.map(function, frames, *[[arg] * len(frames)
+                                              for arg in args]):
+        pass
+
+
+def run_shared(executor: SharedFrameExecutor, function: callable,
+               frames: list[np.ndarray], *args) -> None:
+    for _ in executor.map(function, frames, *args):
+        pass
+
+
+def main() -> None:
+    config_params = load_config_params()
+    source = cv2.imread(sample_images()[0])
+    rows = [("workload", "pickled (ms)", "shared (ms)", "speedup")]
+
+    for label, (width, height) in FRAME_SIZES.items():
+        frame = cv2.resize(source, (width, height))
+        frames = [frame] * FRAME_COUNT
+        workloads = [(f"invert {label}", invert_frame, ()),
+                     (f"lane detection {label}", process_frame,
+                      (config_params,))]
+
+        with ProcessPoolExecutor(WORKERS) as pickled_executor, \
+                SharedFrameExecutor(WORKERS, slot_bytes=frame.nbytes) \
+                as shared_executor:
+            for name, function, args in workloads:
+                pickled_ms = time_call(lambda: run_pickled(
+                    pickled_executor, function, frames, *args), repeat=3)
+                shared_ms = time_call(lambda: run_shared(
+                    shared_executor, function, frames, *args), repeat=3)
+                rows.append((name, f"{pickled_ms:.1f}", f"{shared_ms:.1f}",
+                             f"{pickled_ms / shared_ms:.2f}x"))
+
+    report(f"Pickled vs shared memory transfer ({FRAME_COUNT} frames, "
+           f"{WORKERS} workers)", rows)
+
+
+if __name__ == "__main__":
+    main()
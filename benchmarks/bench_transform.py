@@ -0,0 +1,62 @@
+# benchmarks/bench_transform.py
+"""
+Time the rotation fast paths against the generic affine warp, and the
+cached remap maps against warpAffine/warpPerspective.
+
+Run from the repository root: ``python -m benchmarks.bench_transform``
+"""
+
+from benchmarks.common import report, sample_images, time_call
+from pixelx.visionx_lib.core.base import cv2, np
+from pixelx.visionx_lib.core.enums import RotateType
+from pixelx.visionx_lib.image.transform import rotate_center, \
+    get_rotation_transform, apply_affine_transform, warp_perspective, \
+    build_remap_maps
+
+FRAME_SIZE = (1920, 1080)
+
+
+def warp_rotation(image: np.ndarray, rotate_type: RotateType) -> np.ndarray:
+    height, width = image.shape[:2]
+    matrix, new_size = get_rotation_transform(width, height,
+                                              -rotate_type.value, 1.0)
+    return cv2.warpAffine(image, matrix, new_size)
+
+
+def main() -> None:
+    image = cv2.resize(cv2.imread(sample_images()[0]), FRAME_SIZE)
+    width, height = FRAME_SIZE
+    rows = [("transform", "warp (ms)", "fast (ms)", "speedup")]
+
+    for rotate_type in RotateType:
+        warp_ms = time_call(lambda: warp_rotation(image, rotate_type), 20)
+        fast_ms = time_call(lambda: rotate_center(image, rotate_type), 20)
+        rows.append((f"rotate {rotate_type.value}", f"{warp_ms:.2f}",
+                     f"{fast_ms:.2f}", f"{warp_ms / fast_ms:.2f}x"))
+
+    affine = cv2.getRotationMatrix2D((width / 2, height / 2), 17, 0.9)
+    src_points = np.float32([[0, 0], [width, 0], [width, height],
+                             [0, height]])
+    dst_points = np.float32([[100, 50], [width - 80, 10],
+                             [width, height - 30], [40, height]])
+    transforms = {
+        "affine": lambda cache: apply_affine_transform(
+            image, affine, FRAME_SIZE, cache_maps=cache),
+        "perspective": lambda cache: warp_perspective(
+            image, src_points, dst_points, cache_maps=cache)
+    }
+
+    for name, transform in transforms.items():
+        build_remap_maps.cache_clear()
+        build_ms = time_call(lambda: transform(True), 1)
+        warp_ms = time_call(lambda: transform(False), 20)
+        remap_ms = time_call(lambda: transform(True), 20)
+        rows.append((f"{name} (first call {build_ms:.1f} ms)",
+                     f"{warp_ms:.2f}", f"{remap_ms:.2f}",
+                     f"{warp_ms / remap_ms:.2f}x"))
+
+    report(f"Transform paths on {width}x{height} BGR", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/common.py
+
+import time
+
+from pixelx.visionx_lib.config_manager import ConfigManager, \
+    fetch_processing_params
+from pixelx.visionx_lib.core.base import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "pixelx", "simple_lane_detection")
+CONFIG_PATH = os.path.join(DATA_DIR, "config.json")
+INPUT_IMAGES_DIR = os.path.join(DATA_DIR, "data", "input", "images")
+INPUT_VIDEOS_DIR = os.path.join(DATA_DIR, "data", "input", "videos")
+
+
+def load_config_params() -> tuple[dict, ...]:
+    """Load the processing params of the lane detection project."""
+    return fetch_processing_params(ConfigManager(CONFIG_PATH))
+
+
+def list_inputs(directory: str, extensions: tuple[str, ...]) -> list[str]:
+    """Return the sorted input files with one of the given extensions."""
+    return sorted(os.path.join(directory, name)
+                  for name in os.listdir(directory)
+                  if name.lower().endswith(extensions))
+
+
+def sample_images() -> list[str]:
+    """Return the sample still images."""
+    return list_inputs(INPUT_IMAGES_DIR, (".jpg", ".png"))
+
+
+def sample_videos() -> list[str]:
+    """Return the sample videos."""
+    return list_inputs(INPUT_VIDEOS_DIR, (".mp4",))
+
+
+def time_call(function: callable, repeat: int = 5) -> float:
+    """Return the best wall time in milliseconds of several calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def report(title: str, rows: list[tuple]) -> None:
+    """Print benchmark rows as an aligned table."""
+    print(f"\n{title}")
+    for row in rows:
+        label, *values = row
+        print(f"  {label:<32}" + "".join(f"{value:>14}" for value in values))
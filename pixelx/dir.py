@@ -1,60 +1,236 @@
 # pixelx/dir.py
 
+from pixelx.manifest import load_manifest, save_manifest, is_up_to_date, \
+    record_file
+from collections import deque
+
 from pixelx.visionx_lib.core.base import ImageType, logging, os
+from pixelx.visionx_lib.core.shared_frames import SharedFrameExecutor
 from pixelx.visionx_lib.image import save_image
+from pixelx.visionx_lib.image.async_io import AsyncImageWriter, \
+    prefetch_images
+from pixelx.visionx_lib.lane.io import save_results
 from pixelx.visionx_lib.video.io import save_video_file
 
 
-def get_files_in_directory(directory: str) -> dict[str, str]:
+def scan_files(directory: str, recursive: bool = False,
+               prefix: str = ""):
+    """
+    Yield the names relative to the scanned directory and the full paths
+    of the files in a directory, descending into subdirectories if
+    ``recursive``.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = os.path.join(prefix, entry.name)
+            if entry.is_dir():
+                if recursive:
+                    yield from scan_files(entry.path, recursive, name)
+            elif entry.is_file():
+                yield name, entry.path
+
+
+def get_files_in_directory(directory: str,
+                           recursive: bool = False) -> dict[str, str]:
     """
     Returns a dictionary of file names and their full paths from the
-    given directory.
+    given directory. Names of files in subdirectories are relative paths.
     """
     logging.info(f"Get all files to directory: {directory}")
     try:
-        return {file_name: os.path.join(directory, file_name) for file_name in
-                os.listdir(directory)}
+        return dict(scan_files(directory, recursive))
     except OSError as e:
         logging.error(f"Error accessing directory {directory}: {e}")
         return {}
 
 
+def get_output_path(directory: str, name: str) -> str:
+    """Return the output path of a file, keeping its subdirectory."""
+    subdirectory, file_name = os.path.split(name)
+    return os.path.join(directory, subdirectory, f"Processed_{file_name}")
+
+
+def save_file(directory: str, name: str, file: ImageType | dict,
+              image_writer: AsyncImageWriter | None = None) -> list[str]:
+    """
+    Saves a single processed file, queueing images on the writer if one
+    is given, and returns the output paths.
+    """
+    output_path = get_output_path(directory, name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    image = file if isinstance(file, ImageType) else None
+    outputs = []
+
+    if isinstance(file, dict):
+        image = file.get("image")
+        if image is None and file.get("frames"):
+            save_video_file(
+                file["frames"], output_path=output_path,
+                fps=file["fps"], frame_size=file["frame_size"],
+                codec=file["codec"]
+            )
+            outputs.append(output_path)
+            logging.info(f"Saving Processed_{name}")
+
+        if file.get("video") is not None:
+            # Encoded while processing
+            outputs.append(file["video"])
+
+        if file.get("results") is not None:
+            results_path = save_results(
+                file["results"], output_path,
+                file.get("results_format", "jsonl"))
+            outputs.append(results_path)
+            logging.info(f"Saving {os.path.basename(results_path)}")
+
+    if image is None:
+        return outputs
+
+    if image_writer is None:
+        save_image(image, output_path)
+    else:
+        image_writer.submit(image, output_path)
+    outputs.append(output_path)
+    logging.info(f"Saving Processed_{name}")
+    return outputs
+
+
 def save_files_in_directory(
-        directory: str, files: dict[str, ImageType | dict]) -> None:
-    """Saves the provided files to the specified directory."""
+        directory: str,
+        files: dict[str, ImageType | dict]) -> dict[str, list[str]]:
+    """
+    Saves the provided files to the specified directory and returns the
+    output paths of each file.
+    """
     logging.info(f"Save processed files in directory: {directory}")
+    outputs = {}
     try:
         for name, file in files.items():
-            if isinstance(file, ImageType):
-                image_path = os.path.join(directory, f"Processed_{name}")
-                save_image(file, image_path)
-                logging.info(f"Saving Processed_{name}")
-            elif isinstance(file, dict) and "frames" in file:
-                video_path = os.path.join(directory, f"Processed_{name}")
-                save_video_file(
-                    file["frames"], output_path=video_path,
-                    fps=file["fps"], frame_size=file["frame_size"],
-                    codec=file["codec"]
-                )
-                logging.info(f"Saving Processed_{name}")
+            outputs[name] = save_file(directory, name, file)
     except OSError as e:
         logging.error(f"Error saving files in directory {directory}: {e}")
+    return outputs
+
+
+def process_directory_prefetched(files: dict[str, str], process_function,
+                                 output_directory: str | None,
+                                 prefetch: int, write_queue_size: int,
+                                 decode_options: dict | None = None,
+                                 frame_executor:
+                                 SharedFrameExecutor | None = None,
+                                 decode: bool = True
+                                 ) -> dict[str, list[str]]:
+    """
+    Process image files while the next ones are prefetched and the
+    outputs are written in the background, and return the output paths
+    of each file. With a ``frame_executor``, the images are processed on
+    its process pool through shared memory. Without ``decode``, the
+    function receives the encoded bytes of the images.
+    """
+    names = {path: name for name, path in files.items()}
+    outputs = {}
+    decoded = ((path, image) for path, image in prefetch_images(
+        list(files.values()), prefetch, **(decode_options or {}),
+        decode=decode)
+               if image is not None)
+
+    if frame_executor is None:
+        processed_files = ((path, process_function(image))
+                           for path, image in decoded)
+    else:
+        paths = deque()
+
+        def images():
+            for path, image in decoded:
+                paths.append(path)
+                yield image
+
+        processed_files = (
+            (paths.popleft(), processed)
+            for processed in frame_executor.map(process_function, images()))
+
+    with AsyncImageWriter(queue_size=write_queue_size) as image_writer:
+        for path, processed in processed_files:
+            if output_directory is None or processed is None:
+                continue
+
+            try:
+                outputs[names[path]] = save_file(
+                    output_directory, names[path], processed, image_writer)
+            except OSError as e:
+                logging.error(f"Error saving {names[path]}: {e}")
+    return outputs
+
+
+def filter_outdated_files(files: dict[str, str], manifest: dict,
+                          config_hash: str) -> dict[str, str]:
+    """Return the files whose outputs are missing or out of date."""
+    outdated = {name: path for name, path in files.items()
+                if not is_up_to_date(manifest, path, config_hash)}
+    logging.info(f"{len(files) - len(outdated)} of {len(files)} files "
+                 f"up to date, {len(outdated)} to process")
+    return outdated
+
+
+def update_manifest(manifest_path: str, manifest: dict,
+                    files: dict[str, str], outputs: dict[str, list[str]],
+                    config_hash: str) -> None:
+    """Record the files whose outputs were all written in the manifest."""
+    for name, file_outputs in outputs.items():
+        if file_outputs and all(os.path.exists(output)
+                                for output in file_outputs):
+            record_file(manifest, files[name], config_hash, file_outputs)
+    save_manifest(manifest_path, manifest)
 
 
 def process_directory(directory: str, process_function,
-                      output_directory: str = None) -> None:
+                      output_directory: str = None, prefetch: int = 0,
+                      write_queue_size: int = 8,
+                      decode_options: dict | None = None,
+                      recursive: bool = False,
+                      manifest_path: str | None = None,
+                      config_hash: str | None = None,
+                      frame_executor: SharedFrameExecutor | None = None,
+                      decode_prefetched: bool = True) -> None:
     """
     General function to process files in a directory using a provided
     function.
+
+    With ``prefetch`` the files must be images: they are decoded ahead on
+    a thread pool and the function receives the decoded image instead of
+    its path, decoded with the given ``decode_options`` (see
+    ``load_image``), or its encoded bytes without ``decode_prefetched``.
+    A ``frame_executor`` then processes them on its process pool.
+
+    With a ``manifest_path``, processing is incremental: files whose size,
+    modification time and ``config_hash`` match the manifest and whose
+    outputs still exist are skipped.
     """
     logging.info(f"Processing files in directory: {directory}")
-    files = get_files_in_directory(directory)
+    files = get_files_in_directory(directory, recursive)
+
+    incremental = manifest_path is not None and output_directory is not None
+    if incremental:
+        manifest = load_manifest(manifest_path)
+        files = filter_outdated_files(files, manifest, config_hash)
+
     if not files:
         logging.info("No files to process.")
         return
 
-    processed_files = {
-        name: process_function(path) for name, path in files.items()}
+    if prefetch:
+        outputs = process_directory_prefetched(
+            files, process_function, output_directory, prefetch,
+            write_queue_size, decode_options, frame_executor,
+            decode_prefetched)
+    else:
+        processed_files = {
+            name: process_function(path) for name, path in files.items()}
+
+        if output_directory is None:
+            return
+        outputs = save_files_in_directory(output_directory,
+                                          files=processed_files)
 
-    if output_directory is not None:
-        save_files_in_directory(output_directory, files=processed_files)
+    if incremental:
+        update_manifest(manifest_path, manifest, files, outputs, config_hash)
@@ -0,0 +1,147 @@
+# pixelx/jobs.py
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from pixelx.dir import get_files_in_directory, save_file
+from pixelx.manifest import is_up_to_date, record_file
+from pixelx.visionx_lib.core.base import cv2, json, logging, os, \
+    ImageType
+from pixelx.visionx_lib.core.metrics import disable_metrics
+from pixelx.visionx_lib.video.io import open_video_capture, \
+    get_frame_dimensions
+
+PENDING, DONE, FAILED = "pending", "done", "failed"
+
+
+def estimate_video_memory(video_path: str) -> int:
+    """Estimate the bytes needed to keep every decoded frame of a video."""
+    capture = open_video_capture(video_path)
+    if capture is None:
+        return 0
+
+    try:
+        width, height = get_frame_dimensions(capture)
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        capture.release()
+    return max(frame_count, 1) * width * height * 3
+
+
+def load_job_state(state_path: str) -> dict:
+    """Load the state of a batch, or an empty state if there is none."""
+    if not os.path.exists(state_path):
+        return {"jobs": {}, "files": {}}
+
+    with open(state_path, "r") as file:
+        state = json.load(file)
+    state.setdefault("files", {})  # Done files, recorded as in a manifest
+    return state
+
+
+def save_job_state(state_path: str, state: dict) -> None:
+    """Atomically save the state of a batch."""
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(temp_path, state_path)
+
+
+def init_worker(opencv_threads: int) -> None:
+    """
+    Limit OpenCV threads so concurrent jobs do not oversubscribe cores,
+    and disable the metrics a forked worker inherits, which would never
+    reach the parent's sink.
+    """
+    cv2.setNumThreads(opencv_threads)
+    disable_metrics()
+
+
+def run_job(name: str, path: str, process_function,
+            output_directory: str) -> list[str]:
+    """
+    Process one file and save its output from the worker process, and
+    return the output paths.
+    """
+    processed = process_function(path)
+    if not isinstance(processed, ImageType) and not processed:
+        raise RuntimeError(f"Processing {name} produced no output.")
+
+    return save_file(output_directory, name, processed)
+
+
+def process_jobs(directory: str, process_function, output_directory: str,
+                 state_path: str, config_hash: str,
+                 workers: int | None = None,
+                 memory_budget: int | None = None,
+                 estimate_memory=estimate_video_memory) -> dict:
+    """
+    Process the files of a directory concurrently on a shared process
+    pool, saving each output from its worker.
+
+    Jobs are started largest first while their estimated memory fits in
+    ``memory_budget`` bytes (a job always runs when nothing else does).
+    The batch state is saved after every job, so a restarted batch only
+    runs the files that are not done yet. A file is done while its size,
+    modification time and ``config_hash`` are unchanged and its outputs
+    still exist, as in an incremental manifest.
+    """
+    workers = workers or os.cpu_count() or 1
+    files = get_files_in_directory(directory)
+    state = load_job_state(state_path)
+    jobs = state["jobs"]
+
+    pending = [(name, path) for name, path in files.items()
+               if not is_up_to_date(state, path, config_hash)]
+    logging.info(f"{len(files) - len(pending)} of {len(files)} files "
+                 f"already done, {len(pending)} to process")
+
+    estimates = {path: estimate_memory(path) if estimate_memory else 0
+                 for _, path in pending}
+    pending.sort(key=lambda job: estimates[job[1]], reverse=True)
+    for name, path in pending:
+        jobs[path] = {"name": name, "status": PENDING,
+                      "memory": estimates[path]}
+    save_job_state(state_path, state)
+
+    opencv_threads = max(1, (os.cpu_count() or 1) // workers)
+    in_flight, memory_in_use, finished = {}, 0, 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(opencv_threads,)) as executor:
+        while pending or in_flight:
+            # Start every job that fits in the pool and the memory budget
+            while pending and len(in_flight) < workers:
+                fitting = next(
+                    (job for job in pending if not in_flight
+                     or memory_budget is None
+                     or memory_in_use + estimates[job[1]] <= memory_budget),
+                    None)
+                if fitting is None:
+                    break
+
+                pending.remove(fitting)
+                name, path = fitting
+                future = executor.submit(run_job, name, path,
+                                         process_function, output_directory)
+                in_flight[future] = path
+                memory_in_use += estimates[path]
+                logging.info(f"Started {name} "
+                             f"({estimates[path] / 2 ** 20:.0f} MB estimated)")
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                memory_in_use -= estimates[path]
+                finished += 1
+
+                error = future.exception()
+                jobs[path]["status"] = FAILED if error else DONE
+                jobs[path]["error"] = str(error) if error else None
+                if not error:
+                    record_file(state, path, config_hash, future.result())
+                save_job_state(state_path, state)
+
+                logging.info(f"[{finished}/{len(estimates)}] "
+                             f"{jobs[path]['status']}: {jobs[path]['name']}")
+
+    return state
@@ -0,0 +1,59 @@
+# pixelx/manifest.py
+
+from pixelx.visionx_lib.core.base import json, os
+
+
+def load_manifest(manifest_path: str) -> dict:
+    """Load a processing manifest, or an empty one if there is none."""
+    if not os.path.exists(manifest_path):
+        return {"files": {}}
+
+    with open(manifest_path, "r") as file:
+        return json.load(file)
+
+
+def save_manifest(manifest_path: str, manifest: dict) -> None:
+    """Atomically save a processing manifest."""
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)),
+                exist_ok=True)
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temp_path, manifest_path)
+
+
+def file_signature(path: str) -> dict:
+    """Return the size and modification time identifying a file version."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_up_to_date(manifest: dict, path: str, config_hash: str) -> bool:
+    """
+    Return whether a file was processed in its current version with the
+    same config, and all its outputs still exist.
+    """
+    entry = manifest["files"].get(os.path.abspath(path))
+    if entry is None or entry["config_hash"] != config_hash:
+        return False
+
+    try:
+        signature = file_signature(path)
+    except OSError:
+        return False
+
+    if any(entry[key] != value for key, value in signature.items()):
+        return False
+
+    return bool(entry["outputs"]) and all(
+        os.path.exists(output) for output in entry["outputs"])
+
+
+def record_file(manifest: dict, path: str, config_hash: str,
+                outputs: list[str]) -> None:
+    """Record the outputs of a processed file in the manifest."""
+    manifest["files"][os.path.abspath(path)] = {
+        **file_signature(path),
+        "config_hash": config_hash,
+        "outputs": [os.path.abspath(output) for output in outputs]
+    }
@@ -1,18 +1,33 @@
 # pixelx/simple_lane_detection/runner.py
 
+import argparse
+from contextlib import nullcontext
+from functools import partial
+
 from config import setup_logging, setup_io_directories
-from pixelx.dir import process_directory
+from pixelx.dir import process_directory, get_output_path
+from pixelx.jobs import process_jobs, estimate_video_memory
 from pixelx.visionx_lib.config_manager import ConfigManager, \
-    fetch_processing_params
-from pixelx.visionx_lib.core.base import ImageType, cv2, logging
-from pixelx.visionx_lib.core.enums import VideoCodec
-from pixelx.visionx_lib.image import display_image_cv2
+    fetch_processing_params, hash_processing_params
+from pixelx.visionx_lib.core.base import ImageType, cv2, logging, os
+from pixelx.visionx_lib.core.cache import ResultCache, hash_bytes, \
+    hash_image
+from pixelx.visionx_lib.core.metrics import MetricsFileSink, \
+    enable_metrics, serve_metrics
+from pixelx.visionx_lib.core.shared_frames import SharedFrameExecutor
+from pixelx.visionx_lib.image import display_image_cv2, read_image_bytes, \
+    decode_image, load_image
 from pixelx.visionx_lib.image.display_control import close_all_windows, \
     handle_image_exit
-from pixelx.visionx_lib.lane.detection import process_image
+from pixelx.visionx_lib.image.pyramid import ImagePyramid
+from pixelx.visionx_lib.lane.detection import process_frame, detect_frame, \
+    detect_image, render_result
+from pixelx.visionx_lib.video.async_io import BackgroundVideoWriter
 from pixelx.visionx_lib.video.io import open_video_capture, \
-    get_frame_dimensions, get_frame_rate
-from pixelx.visionx_lib.video.processing import process_video
+    get_frame_dimensions, get_frame_rate, resolve_codec
+from pixelx.visionx_lib.video.deadline import FrameDeadline
+from pixelx.visionx_lib.video.processing import process_video, \
+    AdaptiveFrameScheduler, FrameChangeDetector, get_frame_skip_interval
 
 
 def setup_logging_config():
@@ -30,24 +45,252 @@ def configure_directories():
                                 data_types=["images", "videos"])
 
 
-def pipeline_image(image_path: str, display: bool = False) -> ImageType:
-    """Process an image for lane detection and display the result."""
+def configure_cache() -> ResultCache | None:
+    """Create the detection result cache if it is enabled in the config."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    cache_config = config.get_params("cache", default={})
+    if not cache_config.get("enabled", False):
+        return None
+
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             cache_config["directory"])
+    return ResultCache(cache_dir,
+                       int(cache_config["max_size_mb"] * 1024 * 1024))
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse the command line arguments of the runner."""
+    parser = argparse.ArgumentParser(description="Simple lane detection.")
+    parser.add_argument(
+        "--detect-only", action="store_true",
+        help="Only write line coordinates; skip rendering and encoding.")
+    return parser.parse_args()
+
+
+def configure_output(detect_only: bool = False) -> tuple[bool, str | None]:
+    """Return whether to render outputs and the structured results format."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    output_config = config.get_params("output", default={})
+    render = output_config.get("render", True) and not detect_only
+    results_format = output_config.get("results_format")
+
+    # Detect-only runs must still produce some output
+    if not render and results_format is None:
+        results_format = "jsonl"
+    return render, results_format
+
+
+def configure_io() -> dict:
+    """Return the prefetching, decoding and background writing options."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    io_config = config.get_params("io", default={})
+
+    # Images are decoded in color even in detect-only runs: JPEG grayscale
+    # decodes differ from the converted color image, and so would the
+    # lines. Reduced decodes keep the width needed by preprocessing.
+    decode_options = {}
+    if io_config.get("reduced_decode", False):
+        decode_options["target_width"] = config.get_params(
+            "image_processing", "preprocessing")["width"]
+
+    return {
+        "prefetch": io_config.get("prefetch", 0),
+        "write_queue_size": io_config.get("write_queue_size", 8),
+        "decode_options": decode_options
+    }
+
+
+def configure_frame_workers() -> dict | None:
+    """
+    Return the shared memory frame executor options if frames should be
+    processed on a process pool.
+    """
+    config = ConfigManager("../simple_lane_detection/config.json")
+    io_config = config.get_params("io", default={})
+    if not io_config.get("frame_workers"):
+        return None
+
+    return {
+        "workers": io_config["frame_workers"],
+        "slot_bytes": int(io_config.get("frame_slot_mb", 8) * 1024 * 1024)
+    }
+
+
+def configure_encoder() -> dict:
+    """Return the video encoding options."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    encoder_config = config.get_params("video", "encoder", default={})
+
+    # The output frame rate assumes the fixed processing rate
+    if (encoder_config.get("processed_only", False)
+            and config.get_params("video", "adaptive_rate") is not None):
+        raise ValueError("processed_only cannot be combined with an "
+                         "adaptive_rate.")
+
+    return {
+        "codec": resolve_codec(encoder_config.get("codec", "fast")),
+        "stream": encoder_config.get("stream", False),
+        "queue_size": encoder_config.get("queue_size", 32),
+        "processed_only": encoder_config.get("processed_only", False)
+    }
+
+
+def configure_jobs() -> dict | None:
+    """Return the concurrent video job options if they are enabled."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    jobs_config = config.get_params("jobs", default={})
+    if not jobs_config.get("enabled", False):
+        return None
+
+    budget_mb = jobs_config.get("memory_budget_mb")
+    return {
+        "workers": jobs_config.get("workers"),
+        "memory_budget": (int(budget_mb * 1024 * 1024)
+                          if budget_mb is not None else None),
+        "state_path": os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            jobs_config["state_file"])
+    }
+
+
+def configure_metrics() -> MetricsFileSink | None:
+    """
+    Enable the pipeline metrics if configured, serving them over HTTP
+    and/or writing them to a file. Return the file sink, if any.
+    """
+    config = ConfigManager("../simple_lane_detection/config.json")
+    metrics_config = config.get_params("metrics", default={})
+    if not metrics_config.get("enabled", False):
+        return None
+
+    registry = enable_metrics()
+    if metrics_config.get("port"):
+        serve_metrics(registry, metrics_config["port"])
+    if not metrics_config.get("file"):
+        return None
+
+    return MetricsFileSink(
+        registry,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     metrics_config["file"]),
+        metrics_config.get("interval_s", 10))
+
+
+def hash_output_params(render: bool, results_format: str | None,
+                       decode_options: dict) -> str:
+    """Return the hash of everything that shapes the saved outputs."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    output_params = {"render": render, "results_format": results_format,
+                     "decode_options": decode_options,
+                     "video": config.get_params("video", default={})}
+    return hash_processing_params(
+        (*fetch_processing_params(config), output_params))
+
+
+def configure_incremental(render: bool, results_format: str | None,
+                          decode_options: dict) -> dict:
+    """
+    Return the directory traversal options, with the manifest and the
+    config hash when incremental processing is enabled.
+    """
+    config = ConfigManager("../simple_lane_detection/config.json")
+    directory_config = config.get_params("directory", default={})
+    options = {"recursive": directory_config.get("recursive", False)}
+    if not directory_config.get("incremental", False):
+        return options
+
+    # Outputs are stale whenever anything that shapes them changes
+    options["manifest_path"] = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        directory_config["manifest_file"])
+    options["config_hash"] = hash_output_params(render, results_format,
+                                                decode_options)
+    return options
+
+
+def detect_image_cached(image: str | bytes | ImageType,
+                        config_params: tuple[dict, ...],
+                        cache: ResultCache,
+                        decode_options: dict | None = None,
+                        render: bool = True
+                        ) -> tuple[ImagePyramid | None, dict]:
+    """
+    Detect lanes in an image, reusing the cached result when the image
+    content, the config and the decode options are unchanged.
+
+    Image paths and encoded bytes are looked up before decoding, so a hit
+    only decodes the image to ``render`` it. The image is returned as a
+    pyramid sharing the detection's resized variants, or None when it was
+    not decoded.
+    """
+    decode_options = decode_options or {}
+    image_path = "<buffer>"
+    if isinstance(image, str):
+        image_path, image = image, read_image_bytes(image)
+    content_hash = (hash_bytes(image) if isinstance(image, bytes)
+                    else hash_image(image))
+
+    config_hash = hash_processing_params((*config_params, decode_options))
+    key = cache.make_key(content_hash, config_hash)
+    result = cache.get(key)
+    if result is not None and not render:
+        return None, result
+
+    if isinstance(image, bytes):
+        image = decode_image(image, image_path, **decode_options)
+    pyramid = ImagePyramid(image)
+    if result is None:
+        _, _, result = detect_image(pyramid, config_params)
+        cache.put(key, result)
+    return pyramid, result
+
+
+def pipeline_image(image: str | bytes | ImageType, display: bool = False,
+                   cache: ResultCache | None = None, render: bool = True,
+                   results_format: str | None = None,
+                   decode_options: dict | None = None) -> ImageType | dict:
+    """
+    Process an image for lane detection and display the result.
+
+    When ``results_format`` is set, the detection result is returned
+    alongside the image so it can be saved as structured output. Image
+    paths and encoded bytes are decoded with the given ``decode_options``.
+    """
     logging.info("Starting image processing...")
     try:
         # Initialize config globally
         config = ConfigManager("../simple_lane_detection/config.json")
         config_params = fetch_processing_params(config)
 
-        processed_image, _ = process_image(
-            image_path, config_params=config_params, display=False)
+        # Detection and rendering share the resized variants
+        if cache is None:
+            if isinstance(image, str):
+                image = load_image(image, **(decode_options or {}))
+            elif isinstance(image, bytes):
+                image = decode_image(image, **(decode_options or {}))
+            image = ImagePyramid(image)
+            _, _, result = detect_image(image, config_params)
+        else:
+            image, result = detect_image_cached(
+                image, config_params, cache, decode_options, render)
+
+        processed_image = None
+        if render:
+            processed_image, _ = render_result(image, result, config_params)
 
-        if not display:
+        if display and processed_image is not None:
+            display_image_cv2(processed_image)
+            handle_image_exit()
+            close_all_windows()
+
+        if results_format is None:
             return processed_image
 
-        display_image_cv2(processed_image)
-        handle_image_exit()
-        close_all_windows()
-        return processed_image
+        return {
+            "image": processed_image,
+            "results": [result],
+            "results_format": results_format
+        }
     except FileNotFoundError:
         logging.error(
             "Image file not found. Please check the path.")
@@ -57,8 +300,23 @@ def pipeline_image(image_path: str, display: bool = False) -> ImageType:
         logging.info("Image processing complete.")
 
 
-def pipeline_video(video_path: str, display: bool = False) -> dict:
-    """Process a video for lane detection and display the result."""
+def pipeline_video(video_path: str, display: bool = False,
+                   results_format: str | None = None,
+                   render: bool = True,
+                   frame_workers: int | None = None,
+                   output_path: str | None = None) -> dict:
+    """
+    Process a video for lane detection and display the result.
+
+    Without ``render`` the frames are neither drawn nor kept, so only the
+    detection results are returned. With ``frame_workers``, frames are
+    processed on a process pool through shared memory, unless a frame
+    deadline, an adaptive rate or change detection needs them processed
+    one at a time.
+
+    With an ``output_path``, rendered frames are encoded there in the
+    background while the video is processed, instead of being returned.
+    """
     logging.info("Starting video processing...")
 
     # Initialize config globally
@@ -74,17 +332,69 @@ def pipeline_video(video_path: str, display: bool = False) -> dict:
 
         fps = get_frame_rate(capture)
         frame_size = get_frame_dimensions(capture)
-        processed_frames = process_video(
-            capture, process_function=process_image,
-            config_params=config_params, display=display)
+        processing_rate = config.get_params("video", "processing_rate",
+                                            default=10)
+        frame_budget_ms = config.get_params("video", "frame_budget_ms")
+        deadline = (FrameDeadline(frame_budget_ms)
+                    if frame_budget_ms is not None else None)
+        adaptive_rate = config.get_params("video", "adaptive_rate")
+        scheduler = (AdaptiveFrameScheduler(fps, **adaptive_rate)
+                     if adaptive_rate is not None else None)
+        change_detection = config.get_params("video", "change_detection")
+        change_detector = (FrameChangeDetector(**change_detection)
+                           if change_detection is not None else None)
 
-        codec = VideoCodec.MP4V
+        pooled = (frame_workers and deadline is None and scheduler is None
+                  and change_detector is None and not display)
+        frame_width, frame_height = frame_size
+        executor = (SharedFrameExecutor(
+            frame_workers, slot_bytes=frame_width * frame_height * 3)
+                    if pooled else nullcontext())
+
+        results = [] if results_format is not None else None
+        with executor as frame_executor:
+            if not render:
+                process_video(capture, process_function=detect_frame,
+                              config_params=config_params,
+                              processing_rate=processing_rate,
+                              results=results, detect_only=True,
+                              deadline=deadline, scheduler=scheduler,
+                              executor=frame_executor,
+                              change_detector=change_detector)
+                return {"results": results,
+                        "results_format": results_format}
+
+            # Keeping only processed frames lowers the output frame rate
+            encoder = configure_encoder()
+            output_fps = (
+                fps / get_frame_skip_interval(fps, processing_rate)
+                if encoder["processed_only"] else fps)
+            writer = (BackgroundVideoWriter(
+                output_path, output_fps, frame_size, encoder["codec"],
+                encoder["queue_size"])
+                      if output_path is not None else nullcontext())
+
+            with writer as video_writer:
+                processed_frames = process_video(
+                    capture, process_function=process_frame,
+                    config_params=config_params,
+                    processing_rate=processing_rate, display=display,
+                    results=results, deadline=deadline, scheduler=scheduler,
+                    executor=frame_executor, writer=video_writer,
+                    processed_only=encoder["processed_only"],
+                    change_detector=change_detector)
+
+        if output_path is not None:
+            return {"video": output_path, "results": results,
+                    "results_format": results_format}
 
         return {
             "frames": processed_frames,
-            "fps": fps,
+            "fps": output_fps,
             "frame_size": frame_size,
-            "codec": codec
+            "codec": encoder["codec"],
+            "results": results,
+            "results_format": results_format
         }
 
     except FileNotFoundError:
@@ -92,30 +402,101 @@ def pipeline_video(video_path: str, display: bool = False) -> dict:
             "Video file not found. Please check the path.")
     except Exception as e:
         logging.exception(f"Unexpected error during video processing: {e}")
+        if output_path is not None and os.path.exists(output_path):
+            os.remove(output_path)  # A truncated video is not an output
     finally:
         if capture:
             capture.release()
         logging.info("Video processing complete.")
 
 
+def pipeline_video_streamed(video_path: str, input_directory: str,
+                            output_directory: str, **options) -> dict:
+    """
+    Process a video, encoding the rendered frames to its output path in
+    the background as they are produced.
+    """
+    output_path = get_output_path(
+        output_directory, os.path.relpath(video_path, input_directory))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return pipeline_video(video_path, output_path=output_path, **options)
+
+
 if __name__ == "__main__":
     setup_logging_config()  # Set configuration of project
+    arguments = parse_arguments()
 
     directories = configure_directories()
+    result_cache = configure_cache()
+    metrics_sink = configure_metrics()
+    try:
+        render_outputs, results_format = configure_output(
+            arguments.detect_only)
+        io_options = configure_io()
+        directory_options = configure_incremental(
+            render_outputs, results_format, io_options["decode_options"])
+
+        input_images_dir = directories["input_images_dir"]
+        output_images_dir = directories["output_images_dir"]
+        input_videos_dir = directories["input_videos_dir"]
+        output_videos_dir = directories["output_videos_dir"]
 
-    input_images_dir = directories["input_images_dir"]
-    output_images_dir = directories["output_images_dir"]
-    input_videos_dir = directories["input_videos_dir"]
-    output_videos_dir = directories["output_videos_dir"]
-
-    process_directory(
-        input_images_dir,
-        lambda path: pipeline_image(path, display=False),
-        output_images_dir
-    )
-
-    process_directory(
-        input_videos_dir,
-        lambda path: pipeline_video(path, display=False),
-        output_videos_dir
-    )
+        frame_workers = configure_frame_workers()
+        with (SharedFrameExecutor(**frame_workers) if frame_workers
+              else nullcontext()) as image_executor:
+            # Pooled workers would each update their own copy of the cache,
+            # so its size limit would not hold
+            image_cache = result_cache if image_executor is None else None
+            if result_cache is not None and image_cache is None:
+                logging.info("The result cache is not used with "
+                             "frame_workers.")
+
+            process_directory(
+                input_images_dir,
+                partial(pipeline_image, display=False, cache=image_cache,
+                        render=render_outputs, results_format=results_format,
+                        decode_options=io_options["decode_options"]),
+                output_images_dir,
+                **io_options,
+                **directory_options,
+                frame_executor=image_executor,
+                # Cache hits are looked up from the file bytes, before decoding
+                decode_prefetched=image_cache is None
+            )
+
+        stream_videos = render_outputs and configure_encoder()["stream"]
+        video_function = (
+            partial(pipeline_video_streamed, input_directory=input_videos_dir,
+                    output_directory=output_videos_dir) if stream_videos
+            else pipeline_video)
+
+        job_options = configure_jobs()
+        if job_options is None:
+            process_directory(
+                input_videos_dir,
+                partial(video_function, display=False,
+                        results_format=results_format, render=render_outputs,
+                        frame_workers=(frame_workers
+                                       and frame_workers["workers"])),
+                output_videos_dir,
+                **directory_options
+            )
+        else:
+            # Only rendered videos that are not streamed keep their frames
+            # in memory
+            process_jobs(
+                input_videos_dir,
+                partial(video_function, display=False,
+                        results_format=results_format, render=render_outputs),
+                output_videos_dir,
+                config_hash=hash_output_params(render_outputs, results_format,
+                                               io_options["decode_options"]),
+                estimate_memory=(estimate_video_memory
+                                 if render_outputs and not stream_videos
+                                 else None),
+                **job_options
+            )
+    finally:
+        # Flush the final metrics even if processing fails
+        if metrics_sink is not None:
+            metrics_sink.close()
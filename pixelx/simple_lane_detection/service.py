@@ -0,0 +1,260 @@
+# pixelx/simple_lane_detection/service.py
+
+import base64
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config import setup_logging
+from runner import configure_io, configure_frame_workers, configure_metrics
+from pixelx.visionx_lib.config_manager import ConfigManager, \
+    fetch_processing_params
+from pixelx.visionx_lib.core.base import ImageType, cv2, json, logging, np
+from pixelx.visionx_lib.core.shared_frames import SharedFrameExecutor
+from pixelx.visionx_lib.image import read_image_bytes, decode_image
+from pixelx.visionx_lib.lane.detection import process_frame, detect_frame
+
+
+class LaneService:
+    """
+    Keeps the lane detection pipeline warm and processes requests in
+    batches.
+
+    The config is parsed once and the pipeline is run on a blank frame
+    at startup, so requests only pay for decoding and detection.
+    Requests are queued and a batching thread takes up to ``batch_size``
+    of them at once, waiting at most ``batch_wait_ms`` for a batch to
+    fill; with an ``executor``, the frames of a batch are processed
+    concurrently on its process pool.
+    """
+
+    def __init__(self, config_params: tuple[dict, ...],
+                 decode_options: dict | None = None,
+                 executor: SharedFrameExecutor | None = None,
+                 batch_size: int = 8, batch_wait_ms: float = 5,
+                 image_format: str = ".png", request_timeout_s: float = 30):
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self.config_params = config_params
+        self.decode_options = decode_options or {}
+        self.executor = executor
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self.image_format = image_format
+        self.request_timeout = request_timeout_s
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+        self.warm_up()
+        self._thread.start()
+
+    def warm_up(self) -> None:
+        """Run the pipeline once so the first request is not slower."""
+        width = self.config_params[0].get("width") or 640
+        frame = np.zeros((width * 9 // 16, width, 3), dtype=np.uint8)
+        workers = self.executor.slots if self.executor is not None else 1
+        self.process_frames([frame] * workers, render=True)
+
+    def submit(self, image: str | bytes, render: bool = False) -> Future:
+        """
+        Queue an image path or encoded image bytes and return a future
+        of its result, which includes the encoded rendered image when
+        ``render`` is set.
+        """
+        future = Future()
+        self._queue.put((image, render, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                break
+
+            deadline = time.perf_counter() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=max(0.0, timeout))
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)  # Stop after this batch
+                    break
+                batch.append(request)
+
+            for render in (False, True):
+                requests = [request for request in batch
+                            if request[1] == render]
+                if requests:
+                    try:
+                        self.process_batch(requests, render)
+                    except Exception as e:
+                        # Never let a request stop the batching thread
+                        logging.exception(f"Error processing a batch: {e}")
+                        for _, _, future in requests:
+                            if not future.done():
+                                future.set_exception(e)
+
+    def decode(self, image: str | bytes) -> ImageType:
+        """
+        Decode an image path or encoded image bytes, in color whether or
+        not it is rendered, so both give the same lines.
+        """
+        if isinstance(image, str):
+            return decode_image(read_image_bytes(image), image,
+                                **self.decode_options)
+        return decode_image(image, **self.decode_options)
+
+    def process_frames(self, frames: list[ImageType],
+                       render: bool) -> list[tuple]:
+        """Return the processed frames and results of decoded frames."""
+        function = process_frame if render else detect_frame
+        if self.executor is None:
+            return [function(frame, self.config_params) for frame in frames]
+        return list(self.executor.map(function, frames, self.config_params))
+
+    def process_batch(self, requests: list[tuple], render: bool) -> None:
+        """Process a batch of requests and resolve their futures."""
+        frames, futures = [], []
+        for image, _, future in requests:
+            if not future.set_running_or_notify_cancel():
+                continue  # Timed out while queued
+            try:
+                frames.append(self.decode(image))
+                futures.append(future)
+            except Exception as e:  # Including cv2.error on bad buffers
+                future.set_exception(e)
+
+        try:
+            outputs = self.process_frames(frames, render)
+        except Exception as e:
+            logging.exception(f"Error processing a batch: {e}")
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        for future, (processed_frame, result) in zip(futures, outputs):
+            if processed_frame is not None:
+                _, buffer = cv2.imencode(self.image_format, processed_frame)
+                result = {**result, "image": base64.b64encode(
+                    buffer.tobytes()).decode("ascii")}
+            future.set_result(result)
+
+    def close(self) -> None:
+        """Process the queued requests and stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def make_handler(service: LaneService) -> type:
+    """Return the HTTP request handler class of a service."""
+
+    class LaneRequestHandler(BaseHTTPRequestHandler):
+        def send_json(self, status: int, body: dict) -> None:
+            data = json.dumps(body, separators=(",", ":")).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self.send_json(200, {"status": "ok"})
+            else:
+                self.send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != "/detect":
+                self.send_json(404, {"error": "Not found"})
+                return
+
+            query = parse_qs(url.query)
+            render = query.get("render", ["0"])[0] in ("1", "true")
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            # JSON bodies list image paths; anything else is image bytes
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("application/json"):
+                try:
+                    paths = json.loads(body)["paths"]
+                except (ValueError, KeyError, TypeError):
+                    self.send_json(400, {"error": "Expected {\"paths\": "
+                                                  "[...]}."})
+                    return
+                futures = [service.submit(path, render) for path in paths]
+            elif not body:
+                self.send_json(400, {"error": "Expected image bytes."})
+                return
+            else:
+                futures = [service.submit(body, render)]
+
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result(
+                        timeout=service.request_timeout))
+                except TimeoutError:
+                    future.cancel()
+                    results.append({"error": "Timed out."})
+                except Exception as e:
+                    results.append({"error": str(e)})
+            self.send_json(200, {"results": results})
+
+        def log_message(self, *_):
+            pass  # Requests would flood the log
+
+    return LaneRequestHandler
+
+
+def configure_service() -> dict:
+    """Return the service address and batching options."""
+    config = ConfigManager("../simple_lane_detection/config.json")
+    service_config = config.get_params("service", default={})
+    return {
+        "host": service_config.get("host", "127.0.0.1"),
+        "port": service_config.get("port", 8765),
+        "batch_size": service_config.get("batch_size", 8),
+        "batch_wait_ms": service_config.get("batch_wait_ms", 5),
+        "image_format": service_config.get("image_format", ".png"),
+        "request_timeout_s": service_config.get("request_timeout_s", 30)
+    }
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    config = ConfigManager("../simple_lane_detection/config.json")
+    service_options = configure_service()
+    host, port = service_options.pop("host"), service_options.pop("port")
+    metrics_sink = configure_metrics()
+
+    # Bind first so a busy port fails before the worker pool starts
+    server = ThreadingHTTPServer((host, port), None)
+    frame_workers = configure_frame_workers()
+    executor = SharedFrameExecutor(**frame_workers) if frame_workers else None
+    service = LaneService(
+        fetch_processing_params(config),
+        decode_options=configure_io()["decode_options"],
+        executor=executor, **service_options)
+    server.RequestHandlerClass = make_handler(service)
+
+    logging.info(f"Lane detection service listening on "
+                 f"http://{host}:{port}/detect")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if executor is not None:
+            executor.close()
+        if metrics_sink is not None:
+            metrics_sink.close()
@@ -1,6 +1,7 @@
 # pixelx/visionx_lib/config_manager.py
 
 from pixelx.visionx_lib.core.base import os, json
+from pixelx.visionx_lib.core.cache import hash_bytes
 
 from pixelx.visionx_lib.core.enums import MASK_COLORS
 
@@ -37,7 +38,9 @@ def fetch_processing_params(config: ConfigManager):
     edge_params = config.get_params("image_processing", "edge_detection")
     gaussian_blur_params = edge_params.get("gaussian_blur", {})
     canny_params = edge_params.get("canny", {})
-    edge_config = {**gaussian_blur_params, **canny_params}
+    edge_config = {**gaussian_blur_params, **canny_params,
+                   "method": edge_params.get("method", "canny"),
+                   "color_mask": edge_params.get("color_mask")}
 
     # Fetch ROI mask parameters
     mask_config: dict = config.get_params("image_processing", "roi_mask")
@@ -62,3 +65,9 @@ def fetch_processing_params(config: ConfigManager):
 
     return (preprocess_config, edge_config, mask_config,
             detect_config, draw_config)
+
+
+def hash_processing_params(config_params: tuple[dict, ...]) -> str:
+    """Return a stable hash of the compiled processing parameters."""
+    serialized = json.dumps(config_params, sort_keys=True, default=str)
+    return hash_bytes(serialized.encode("utf-8"))
@@ -0,0 +1,109 @@
+# pixelx/visionx_lib/core/cache.py
+
+import hashlib
+from collections import OrderedDict
+
+from pixelx.visionx_lib.core.base import np, json, logging, os
+
+
+def hash_bytes(data: bytes | memoryview) -> str:
+    """Return a fast content hash of the given bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_image(image: np.ndarray) -> str:
+    """Return a fast content hash of a decoded image and its shape."""
+    digest = hashlib.blake2b(str(image.shape).encode("ascii"), digest_size=16)
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of detection results keyed by content and config hashes.
+
+    Entries are small JSON files; the least recently used ones are evicted
+    once the total size of the cache exceeds ``max_size_bytes``.
+    """
+
+    def __init__(self, directory: str, max_size_bytes: int):
+        if not isinstance(max_size_bytes, int) or max_size_bytes <= 0:
+            raise ValueError("max_size_bytes must be a positive integer.")
+
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._entries: OrderedDict[str, int] = self._scan_entries()
+        self._total_size = sum(self._entries.values())
+
+    def _scan_entries(self) -> OrderedDict:
+        """Index existing entries from the oldest to the most recently used."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append(
+                        (stat.st_mtime_ns, entry.name[:-5], stat.st_size))
+
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def make_key(content_hash: str, config_hash: str) -> str:
+        """Combine a content hash and a config hash into a cache key."""
+        return f"{content_hash}-{config_hash}"
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached result for a key, or None on a miss."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as file:
+                result = json.load(file)
+            os.utime(path)  # Persist recency for the next run
+        except (OSError, ValueError) as e:
+            logging.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a result and evict old entries if the cache is too large."""
+        path = self._entry_path(key)
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(result, file)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logging.error(f"Error writing cache entry {key}: {e}")
+            return
+
+        self._total_size += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        self._total_size -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the size limit is met."""
+        while self._total_size > self.max_size_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
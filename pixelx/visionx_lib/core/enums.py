@@ -15,6 +15,14 @@ class RotateType(Enum):
     ROTATE_270 = 270
 
 
+class FilterMethod(Enum):
+    AUTO = "auto"
+    DENSE = "dense"
+    SEPARABLE = "separable"
+    BOX = "box"
+    DFT = "dft"
+
+
 class MaskType(Enum):
     TRIANGLE = "triangle"
     RECTANGULAR = "rectangular"
@@ -35,6 +43,29 @@ def to_bgr(rgb_color: tuple[int, int, int]) -> tuple:
     return rgb_color[::-1]
 
 
+class EdgeMethod(Enum):
+    CANNY = "canny"
+    COLOR = "color"
+
+
+class HoughMethod(Enum):
+    PROBABILISTIC = "probabilistic"
+    BANDED = "banded"
+    LSD = "lsd"
+
+
+class FitMethod(Enum):
+    LEAST_SQUARES = "least_squares"
+    WEIGHTED = "weighted"
+    RANSAC = "ransac"
+
+
+class LineSide(Enum):
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+
+
 class ChannelType(Enum):
     BLUE = 0
     GREEN = 1
@@ -0,0 +1,180 @@
+# pixelx/visionx_lib/core/metrics.py
+
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pixelx.visionx_lib.core.base import logging, os
+
+# Default histogram buckets (upper bounds), for latencies in milliseconds
+# and for counts of detected segments
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+COUNT_BUCKETS = (0, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Registry shared by the process, or None while metrics are disabled
+_registry: "MetricsRegistry | None" = None
+
+
+class Histogram:
+    """Cumulative histogram of observations over fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Add an observation to its bucket."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms identified by a name and labels, rendered in
+    the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.counters: dict[tuple, float] = {}
+        self.histograms: dict[tuple, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Add a value to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float,
+                buckets: tuple[float, ...] = LATENCY_BUCKETS_MS,
+                **labels) -> None:
+        """Add an observation to a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(buckets)
+            self.histograms[key].observe(value)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        lines, typed = [], set()
+
+        def header(name: str, metric_type: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, "counter")
+                lines.append(f"{name}{format_labels(labels)} {value:g}")
+
+            for (name, labels), histogram in sorted(
+                    self.histograms.items(), key=lambda item: item[0]):
+                header(name, "histogram")
+                cumulative = 0
+                bounds = [*map(str, histogram.buckets), "+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket"
+                                 f"{format_labels(labels, le=bound)} "
+                                 f"{cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} "
+                             f"{histogram.sum:g}")
+                lines.append(f"{name}_count{format_labels(labels)} "
+                             f"{histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically write every metric to a text file."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
+
+
+def format_labels(labels: tuple, **extra) -> str:
+    """Return labels in the Prometheus ``{name="value"}`` syntax."""
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def enable_metrics() -> MetricsRegistry:
+    """Enable metrics collection for this process and return the registry."""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def disable_metrics() -> None:
+    """Disable metrics collection for this process."""
+    global _registry
+    _registry = None
+
+
+def get_metrics() -> MetricsRegistry | None:
+    """Return the registry, or None if metrics are disabled."""
+    return _registry
+
+
+def serve_metrics(registry: MetricsRegistry, port: int,
+                  host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the metrics at ``/metrics`` from a background thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type",
+                             "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass  # Scrapes would flood the log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Serving metrics at http://{host}:{port}/metrics")
+    return server
+
+
+class MetricsFileSink:
+    """Writes the metrics to a file periodically and when closed."""
+
+    def __init__(self, registry: MetricsRegistry, path: str,
+                 interval: float = 10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write(self.path)
+
+    def close(self) -> None:
+        """Stop the periodic writes and write the final metrics."""
+        self._stop.set()
+        self._thread.join()
+        self.registry.write(self.path)
+
+    def __enter__(self) -> "MetricsFileSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,226 @@
+# pixelx/visionx_lib/core/shared_frames.py
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from pixelx.visionx_lib.core.base import cv2, np, os, ImageType
+
+# Shared memory blocks attached by this worker process, by name
+_attached_memory: dict[str, SharedMemory] = {}
+
+
+class SharedFrameRing:
+    """
+    A ring of fixed-size frame slots in one shared memory block.
+
+    Frames are copied into a free slot and only a small handle (block
+    name, slot, shape and dtype) travels between processes; the other
+    side reads the frame in place through ``frame_view``.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int):
+        if slots < 1 or slot_bytes < 1:
+            raise ValueError("Slots and slot size must be positive.")
+
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.memory = SharedMemory(create=True, size=slots * slot_bytes)
+        self.free = deque(range(slots))
+
+    @property
+    def name(self) -> str:
+        """Return the name other processes attach the block with."""
+        return self.memory.name
+
+    def make_handle(self, slot: int, shape: tuple[int, ...],
+                    dtype: np.dtype) -> dict:
+        """Return the handle of a frame stored in a slot."""
+        return {"name": self.name, "offset": slot * self.slot_bytes,
+                "slot_bytes": self.slot_bytes, "slot": slot,
+                "shape": tuple(shape), "dtype": np.dtype(dtype).str}
+
+    def put(self, frame: ImageType) -> dict:
+        """Copy a frame into a free slot and return its handle."""
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes does not fit in "
+                             f"a slot of {self.slot_bytes} bytes.")
+        if not self.free:
+            raise RuntimeError("No free frame slot.")
+
+        handle = self.make_handle(self.free.popleft(), frame.shape,
+                                  frame.dtype)
+        np.copyto(frame_view(handle, self.memory), frame)
+        return handle
+
+    def get(self, handle: dict) -> ImageType:
+        """Return a copy of the frame stored under a handle."""
+        return frame_view(handle, self.memory).copy()
+
+    def release(self, handle: dict) -> None:
+        """Return the slot of a handle to the free slots."""
+        self.free.append(handle["slot"])
+
+    def close(self) -> None:
+        """Release and remove the shared memory block."""
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def attach_memory(name: str) -> SharedMemory:
+    """Attach a shared memory block once per process."""
+    if name not in _attached_memory:
+        _attached_memory[name] = SharedMemory(name=name)
+    return _attached_memory[name]
+
+
+def frame_view(handle: dict, memory: SharedMemory | None = None) -> ImageType:
+    """Return a NumPy view of the frame stored under a handle."""
+    memory = memory or attach_memory(handle["name"])
+    return np.ndarray(handle["shape"], dtype=np.dtype(handle["dtype"]),
+                      buffer=memory.buf, offset=handle["offset"])
+
+
+def write_frame(handle: dict, frame: ImageType) -> dict | None:
+    """
+    Write a frame into the slot of a handle and return its new handle,
+    or None if the frame does not fit.
+    """
+    if frame.nbytes > handle["slot_bytes"]:
+        return None
+
+    output_handle = {**handle, "shape": tuple(frame.shape),
+                     "dtype": frame.dtype.str}
+    np.copyto(frame_view(output_handle), frame)
+    return output_handle
+
+
+def pack_output(output, handle: dict) -> tuple:
+    """
+    Move the frame of a process function output into the input slot.
+
+    Frames are found as the output itself, the first item of a tuple or
+    the ``image`` of a dict; anything else is returned as is.
+    """
+    if isinstance(output, ImageType):
+        frame, rest, kind = output, None, "frame"
+    elif (isinstance(output, tuple) and output
+          and isinstance(output[0], ImageType)):
+        frame, rest, kind = output[0], output[1:], "tuple"
+    elif isinstance(output, dict) and isinstance(output.get("image"),
+                                                 ImageType):
+        frame, kind = output["image"], "dict"
+        rest = {key: value for key, value in output.items() if key != "image"}
+    else:
+        return "value", None, output
+
+    output_handle = write_frame(handle, frame)
+    if output_handle is None:
+        return "value", None, output  # Too large for the slot
+    return kind, output_handle, rest
+
+
+def unpack_output(packed: tuple, ring: SharedFrameRing):
+    """Rebuild a process function output from its packed form."""
+    kind, output_handle, rest = packed
+    if kind == "value":
+        return rest
+
+    frame = ring.get(output_handle)
+    if kind == "frame":
+        return frame
+    if kind == "tuple":
+        return frame, *rest
+    return {"image": frame, **rest}
+
+
+def init_frame_worker(opencv_threads: int) -> None:
+    """Limit OpenCV threads so workers do not oversubscribe cores."""
+    cv2.setNumThreads(opencv_threads)
+
+
+def process_shared_frame(process_function: callable, handle: dict,
+                         args: tuple, kwargs: dict) -> tuple:
+    """Process the frame of a handle in place and pack the output."""
+    output = process_function(frame_view(handle), *args, **kwargs)
+    return pack_output(output, handle)
+
+
+class SharedFrameExecutor:
+    """
+    Runs frame processing functions on a process pool, passing frames
+    through a shared memory ring instead of pickling them.
+
+    At most ``slots`` frames are in flight; each output frame is written
+    back into its input slot and copied out when the task is collected.
+    """
+
+    def __init__(self, workers: int | None = None, slots: int | None = None,
+                 slot_bytes: int = 1920 * 1080 * 3):
+        self.workers = workers or os.cpu_count() or 1
+        self.ring = SharedFrameRing(slots or 2 * self.workers, slot_bytes)
+        self.handles: dict[Future, dict] = {}
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=init_frame_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // self.workers),))
+
+    @property
+    def slots(self) -> int:
+        """Return the number of frames that can be in flight."""
+        return self.ring.slots
+
+    def submit(self, process_function: callable, frame: ImageType, *args,
+               **kwargs) -> Future:
+        """
+        Copy a frame into a free slot and process it on the pool; frames
+        larger than a slot are pickled instead.
+        """
+        if frame.nbytes > self.ring.slot_bytes:
+            return self.executor.submit(process_function, frame, *args,
+                                        **kwargs)
+
+        handle = self.ring.put(frame)
+        future = self.executor.submit(process_shared_frame, process_function,
+                                      handle, args, kwargs)
+        self.handles[future] = handle
+        return future
+
+    def collect(self, future: Future):
+        """Wait for a task, return its output and free its slot."""
+        handle = self.handles.pop(future, None)
+        if handle is None:
+            return future.result()
+
+        try:
+            return unpack_output(future.result(), self.ring)
+        finally:
+            self.ring.release(handle)
+
+    def map(self, process_function: callable, frames, *args, **kwargs):
+        """Yield the outputs of processing frames in order."""
+        pending = deque()
+        for frame in frames:
+            if len(pending) == self.slots:
+                yield self.collect(pending.popleft())
+            pending.append(self.submit(process_function, frame, *args,
+                                       **kwargs))
+
+        while pending:
+            yield self.collect(pending.popleft())
+
+    def close(self) -> None:
+        """Shut down the pool and remove the shared memory ring."""
+        self.executor.shutdown()
+        self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -1,7 +1,8 @@
 # pixelx/visionx_lib/core/validations.py
 
 from pixelx.visionx_lib.core.base import np, ImageType
-from pixelx.visionx_lib.core.enums import RotateType, FlipType, ChannelType
+from pixelx.visionx_lib.core.enums import RotateType, FlipType, ChannelType, \
+    FilterMethod
 
 
 # ----------------- General Image Validation -----------------
@@ -129,6 +130,12 @@ def validate_2d_filter_kernel(kernel: np.ndarray) -> None:
         raise ValueError("Kernel must be a 2D matrix.")
 
 
+def validate_filter_method(method: FilterMethod) -> None:
+    """Validate the method of a 2D convolution filter."""
+    if not isinstance(method, FilterMethod):
+        raise ValueError("method must be an instance of FilterMethod Enum.")
+
+
 # -----------------  Thresholding & Intensity Validation -----------------
 
 def validate_threshold(threshold_lower: int, threshold_higher: int) -> None:
@@ -159,6 +166,20 @@ def validate_threshold_values(thresh: int, maxval: int) -> None:
         raise ValueError(f"Max value must be between 0 and 255, got {maxval}.")
 
 
+def validate_channel_range(lower: list[int], upper: list[int]) -> None:
+    """Validate per-channel lower and upper bounds of a color range."""
+    for bounds in (lower, upper):
+        if (not isinstance(bounds, list | tuple) or len(bounds) != 3
+                or not all(isinstance(value, int) and 0 <= value <= 255
+                           for value in bounds)):
+            raise ValueError("Color range bounds must be three integers "
+                             "between 0 and 255.")
+
+    if any(low > high for low, high in zip(lower, upper)):
+        raise ValueError("Color range lower bounds must not exceed the "
+                         "upper bounds.")
+
+
 def validate_adaptive_threshold_params(max_value: int, block_size: int,
                                        c: int) -> None:
     """Validate parameters for adaptive thresholding."""
@@ -174,6 +195,17 @@ def validate_adaptive_threshold_params(max_value: int, block_size: int,
         raise ValueError("C must be an integer.")
 
 
+# -----------------  Tiling Validation -----------------
+
+def validate_tile_params(tile_size: int, halo: int) -> None:
+    """Validate the tile size and halo of tiled processing."""
+    if not isinstance(tile_size, int) or tile_size <= 0:
+        raise ValueError("Tile size must be a positive integer.")
+
+    if not isinstance(halo, int) or halo < 0:
+        raise ValueError("Halo must be a non-negative integer.")
+
+
 # -----------------  Resizing & Scaling Validation -----------------
 
 def validate_resize_factors(factor_x: float, factor_y: float = None) -> None:
@@ -1,11 +1,19 @@
 # pixelx/visionx_lib/image/__init__.py
 
 from .filters import apply_gaussian_blur
-from .color_conversion import convert_to_rgb2grayscale, convert_bgr2rgb
-from .resize import resize_by_aspect_ratio
-from .edge_detection import apply_canny_edge_detection, apply_detect_hough_lines
+from .color_conversion import convert_to_rgb2grayscale, convert_bgr2rgb, \
+    ensure_grayscale
+from .resize import resize_by_aspect_ratio, resize_by_width_height
+from .edge_detection import apply_canny_edge_detection, apply_detect_hough_lines, \
+    apply_detect_hough_lines_bounded, apply_detect_hough_lines_banded, \
+    apply_detect_lsd_lines
 from .roi_masks import apply_roi_mask
-from .threshold import apply_threshold, apply_adaptive_threshold
+from .threshold import apply_threshold, apply_adaptive_threshold, \
+    apply_color_range_mask
 from .transform import flip_image, rotate_center, warp_perspective, \
     apply_affine_transform
-from .io import load_image, save_image, display_image_cv2, display_image_plt
+from .io import load_image, save_image, display_image_cv2, display_image_plt, \
+    read_image_bytes, decode_image
+from .tiling import process_tiled, open_image_memmap, create_image_memmap
+from .pyramid import ImagePyramid
+from .lut import apply_lut, apply_point_operations, compile_point_operations
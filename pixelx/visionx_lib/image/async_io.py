@@ -0,0 +1,130 @@
+# pixelx/visionx_lib/image/async_io.py
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from pixelx.visionx_lib.core import validations
+from pixelx.visionx_lib.core.base import cv2, ImageType, Path, logging
+from pixelx.visionx_lib.image.io import read_image_bytes, decode_image
+
+
+def read_and_decode_image(image_path: str, target_width: int | None = None,
+                          grayscale: bool = False) -> ImageType:
+    """Read an image file in one call and decode it from memory."""
+    return decode_image(read_image_bytes(image_path), image_path,
+                        target_width, grayscale)
+
+
+def prefetch_images(image_paths: list[str], depth: int = 4,
+                    workers: int | None = None, target_width: int | None = None,
+                    grayscale: bool = False, decode: bool = True
+                    ) -> Iterator[tuple[str, ImageType | bytes | None]]:
+    """
+    Yield ``(path, image)`` pairs in order while the next ``depth`` images
+    are read and decoded on a thread pool. Without ``decode``, the encoded
+    bytes are yielded instead. Images that cannot be loaded are logged
+    and yielded as None.
+    """
+    if not isinstance(depth, int) or depth <= 0:
+        raise ValueError("Prefetch depth must be a positive integer.")
+
+    paths = iter(image_paths)
+    with ThreadPoolExecutor(max_workers=workers or depth) as executor:
+        pending = deque()
+
+        def submit_next() -> None:
+            path = next(paths, None)
+            if path is None:
+                return
+            if decode:
+                future = executor.submit(read_and_decode_image, path,
+                                         target_width, grayscale)
+            else:
+                future = executor.submit(read_image_bytes, path)
+            pending.append((path, future))
+
+        for _ in range(depth):
+            submit_next()
+
+        while pending:
+            path, future = pending.popleft()
+            submit_next()
+            try:
+                yield path, future.result()
+            except (OSError, ValueError, TypeError) as e:
+                logging.error(f"Could not load image {path}: {e}")
+                yield path, None
+
+
+def encode_and_write_image(image: ImageType, output_path: str) -> None:
+    """Encode an image according to its extension and write it to disk."""
+    validations.validate_image(image, output_path)
+
+    output_file = Path(output_path)
+    success, buffer = cv2.imencode(output_file.suffix, image)
+    if not success:
+        raise ValueError(f"Could not encode image for {output_path}")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_bytes(buffer.tobytes())
+
+
+class AsyncImageWriter:
+    """
+    Encodes and writes images on background threads.
+
+    The queue is bounded so a slow disk applies back-pressure instead of
+    accumulating every pending image in memory.
+    """
+
+    def __init__(self, queue_size: int = 8, workers: int = 1):
+        if not isinstance(queue_size, int) or queue_size <= 0:
+            raise ValueError("Queue size must be a positive integer.")
+
+        self.written = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            image, output_path = item
+            try:
+                encode_and_write_image(image, output_path)
+                written, failed = 1, 0
+            except (OSError, ValueError, TypeError, cv2.error) as e:
+                logging.error(f"Error saving image {output_path}: {e}")
+                written, failed = 0, 1
+
+            with self._lock:
+                self.written += written
+                self.failed += failed
+
+    def submit(self, image: ImageType, output_path: str) -> None:
+        """Queue an image for writing, blocking while the queue is full."""
+        self._queue.put((image, output_path))
+
+    def close(self) -> None:
+        """Wait until all queued images are written and stop the threads."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "AsyncImageWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
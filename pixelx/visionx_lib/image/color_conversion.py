@@ -16,9 +16,17 @@ def convert_bgr2rgb(image: ImageType) -> ImageType:
     return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
 
+def convert_bgr2hls(image: ImageType) -> ImageType:
+    """Convert a BGR image to HLS format."""
+    validations.validate_bgr_channels(image)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2HLS)
+
+
 def ensure_grayscale(image: ImageType) -> ImageType:
     """Convert an image to grayscale if it's not already."""
-    if image.ndim == 3 and image.shape[2] == 3:
+    if image.ndim == 2:
+        return image
+    elif image.ndim == 3 and image.shape[2] == 3:
         return convert_to_rgb2grayscale(image)
     elif image.ndim == 3 and image.shape[2] == 1:
         # Single-channel stored in 3D
@@ -1,8 +1,21 @@
 # pixelx/visionx_lib/image/edge_detection.py
 
+from functools import lru_cache
+
 from pixelx.visionx_lib.core import validations
 from pixelx.visionx_lib.core.base import cv2, np, ImageType
 
+# Largest distance in pixels between an edge pixel and a Hough line for
+# the pixel to belong to one of the line's segments
+SEGMENT_TOLERANCE = 1.0
+
+
+def compute_canny_thresholds(median: float,
+                             sigma: float = 0.3) -> tuple[int, int]:
+    """Return the Canny thresholds adjusted to the median intensity."""
+    return (max(0, int((1.0 - sigma) * median)),
+            max(255, int((1.0 + sigma) * median)))
+
 
 def apply_canny_edge_detection(
         image: ImageType, threshold_lower: int | None = None,
@@ -13,10 +26,8 @@ def apply_canny_edge_detection(
 
     if not threshold_lower and not threshold_higher:
         # Compute median of the pixel intensities
-        median = np.median(image)
-        # Adjust thresholds based on median
-        threshold_lower = max(0, int((1.0 - sigma) * median))
-        threshold_higher = max(255, int((1.0 + sigma) * median))
+        threshold_lower, threshold_higher = compute_canny_thresholds(
+            np.median(image), sigma)
 
     return cv2.Canny(image, threshold1=threshold_lower,
                      threshold2=threshold_higher)
@@ -29,3 +40,134 @@ def apply_detect_hough_lines(image: ImageType, rho: float, theta_degrees: float,
     return cv2.HoughLinesP(
         image, rho, theta, threshold, np.array([]),
         minLineLength=min_line_length, maxLineGap=max_line_gap)
+
+
+def apply_detect_hough_lines_bounded(
+        image: ImageType, rho: float, theta_degrees: float, threshold: int,
+        min_line_length: float, max_line_gap: float, max_lines: int,
+        overflow_ratio: float = 4.0) -> ImageType:
+    """
+    Detect lines with probabilistic Hough, re-running it once with a
+    proportionally higher vote threshold when the number of lines exceeds
+    ``max_lines * overflow_ratio``.
+    """
+    lines = apply_detect_hough_lines(image, rho, theta_degrees, threshold,
+                                     min_line_length, max_line_gap)
+    if lines is None or len(lines) <= max_lines * overflow_ratio:
+        return lines
+
+    adjusted_threshold = int(
+        np.ceil(threshold * np.sqrt(len(lines) / max_lines)))
+    retried = apply_detect_hough_lines(image, rho, theta_degrees,
+                                       adjusted_threshold, min_line_length,
+                                       max_line_gap)
+    return lines if retried is None else retried
+
+
+def get_lane_theta_bands(slope_threshold: float
+                         ) -> tuple[tuple[float, float], tuple[float, float]]:
+    """
+    Return the ranges of Hough normal angles of lines at least as steep
+    as ``slope_threshold``, for negative (left) and positive (right)
+    slopes.
+    """
+    limit = np.pi / 2 if slope_threshold == 0 else np.arctan(
+        1 / slope_threshold)
+    return (0.0, limit), (np.pi - limit, np.pi)
+
+
+def extract_line_segments(points: np.ndarray, lines: np.ndarray,
+                          min_line_length: float, max_line_gap: float,
+                          tolerance: float = SEGMENT_TOLERANCE) -> list:
+    """
+    Split infinite Hough lines into the segments of the edge points lying
+    on them, like ``cv2.HoughLinesP`` does.
+
+    Lines are processed from the strongest; each point belongs to the
+    first segment that claims it. Runs of points are split at gaps above
+    ``max_line_gap`` and kept if at least ``min_line_length`` long.
+    """
+    x_coords, y_coords = points[:, 0], points[:, 1]
+    free = np.ones(len(points), dtype=bool)
+    segments = []
+
+    for rho, theta in lines.reshape(-1, 2):
+        cos, sin = np.cos(theta), np.sin(theta)
+        on_line = np.flatnonzero(
+            free & (np.abs(x_coords * cos + y_coords * sin - rho)
+                    <= tolerance))
+        if on_line.size < 2:
+            continue
+
+        # Order the points along the line direction (-sin, cos)
+        positions = y_coords[on_line] * cos - x_coords[on_line] * sin
+        order = np.argsort(positions)
+        on_line, positions = on_line[order], positions[order]
+
+        gaps = np.flatnonzero(np.diff(positions) > max_line_gap)
+        starts, ends = np.r_[0, gaps + 1], np.r_[gaps, on_line.size - 1]
+        for start, end in zip(starts, ends):
+            if positions[end] - positions[start] < min_line_length:
+                continue
+            first, last = points[on_line[start]], points[on_line[end]]
+            segments.append((*first, *last))
+            free[on_line[start:end + 1]] = False
+
+    return segments
+
+
+def apply_detect_hough_lines_banded(
+        image: ImageType, rho: float, theta_degrees: float, threshold: int,
+        min_line_length: float, max_line_gap: float, slope_threshold: float,
+        max_band_lines: int = 8) -> np.ndarray | None:
+    """
+    Detect line segments with a standard Hough transform restricted to
+    the angles of lane lines, returned like ``cv2.HoughLinesP``.
+
+    Only the normal angles of lines steeper than ``slope_threshold`` are
+    voted on, and the ``max_band_lines`` strongest lines of each side
+    are split into segments by ``extract_line_segments``.
+    """
+    theta = np.pi / theta_degrees
+    band_lines = []
+    for min_theta, max_theta in get_lane_theta_bands(slope_threshold):
+        lines = cv2.HoughLines(image, rho, theta, threshold,
+                               min_theta=min_theta, max_theta=max_theta)
+        if lines is not None:
+            band_lines.append(lines[:max_band_lines])
+
+    if not band_lines:
+        return None
+
+    points = cv2.findNonZero(image).reshape(-1, 2)
+    segments = [segment for lines in band_lines
+                for segment in extract_line_segments(
+                    points, lines, min_line_length, max_line_gap)]
+    if not segments:
+        return None
+    return np.array(segments, dtype=np.int32).reshape(-1, 1, 4)
+
+
+@lru_cache(maxsize=1)
+def get_line_segment_detector() -> cv2.LineSegmentDetector:
+    """Return the line segment detector, created once per process."""
+    return cv2.createLineSegmentDetector()
+
+
+def apply_detect_lsd_lines(image: ImageType,
+                           min_line_length: float) -> np.ndarray | None:
+    """
+    Detect line segments with the LSD detector, returned like
+    ``cv2.HoughLinesP`` without the segments shorter than
+    ``min_line_length``.
+    """
+    lines = get_line_segment_detector().detect(image)[0]
+    if lines is None:
+        return None
+
+    lines = lines.reshape(-1, 4)
+    lengths = np.hypot(lines[:, 2] - lines[:, 0], lines[:, 3] - lines[:, 1])
+    lines = lines[lengths >= min_line_length]
+    if len(lines) == 0:
+        return None
+    return np.rint(lines).astype(np.int32).reshape(-1, 1, 4)
@@ -2,6 +2,17 @@
 
 from pixelx.visionx_lib.core import validations
 from pixelx.visionx_lib.core.base import cv2, np, ImageType
+from pixelx.visionx_lib.core.enums import FilterMethod
+
+# Largest kernel size for which two 1D passes beat the dense filter,
+# measured on 1080p images with benchmarks/bench_filters.py. The dense
+# filter already switches to the DFT internally for large kernels, so
+# the explicit DFT path is never faster and is only used on request
+SEPARABLE_MAX_SIZE = 64
+
+# Largest ratio of the second to the first singular value of a kernel
+# considered separable
+SEPARABLE_TOLERANCE = 1e-6
 
 
 def apply_gaussian_blur(image: ImageType,
@@ -32,7 +43,105 @@ def apply_bilateral_filter(img: ImageType, diameter: int, sigma_color: float,
     return cv2.bilateralFilter(img, diameter, sigma_color, sigma_space)
 
 
-def filter_2d(img: ImageType, kernel: np.ndarray) -> ImageType:
-    """Apply a 2D convolution filter to the image."""
+def split_separable_kernel(
+        kernel: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return the column and row kernels of a rank-1 kernel, or None."""
+    u, singular_values, vt = np.linalg.svd(kernel.astype(np.float64))
+    if singular_values[0] == 0 or (
+            len(singular_values) > 1
+            and singular_values[1] > SEPARABLE_TOLERANCE * singular_values[0]):
+        return None
+
+    scale = np.sqrt(singular_values[0])
+    return ((u[:, 0] * scale).astype(np.float32),
+            (vt[0] * scale).astype(np.float32))
+
+
+def is_box_kernel(kernel: np.ndarray) -> bool:
+    """Return whether a kernel averages a constant window."""
+    return bool(np.all(kernel == kernel.flat[0])
+                and np.isclose(kernel.sum(), 1))
+
+
+def filter_2d_dft(img: ImageType, kernel: np.ndarray) -> ImageType:
+    """
+    Apply a 2D correlation filter through the DFT, with the same anchor
+    and border handling as ``cv2.filter2D``.
+    """
+    kernel_height, kernel_width = kernel.shape
+    anchor_y, anchor_x = kernel_height // 2, kernel_width // 2
+    height, width = img.shape[:2]
+
+    padded = cv2.copyMakeBorder(
+        img, anchor_y, kernel_height - 1 - anchor_y, anchor_x,
+        kernel_width - 1 - anchor_x, cv2.BORDER_REFLECT_101)
+    padded_height, padded_width = padded.shape[:2]
+    dft_height = cv2.getOptimalDFTSize(padded_height)
+    dft_width = cv2.getOptimalDFTSize(padded_width)
+
+    kernel_padded = np.zeros((dft_height, dft_width), np.float32)
+    kernel_padded[:kernel_height, :kernel_width] = kernel
+    kernel_spectrum = cv2.dft(kernel_padded, flags=cv2.DFT_COMPLEX_OUTPUT)
+
+    filtered_channels = []
+    for channel in cv2.split(padded):
+        channel_padded = np.zeros((dft_height, dft_width), np.float32)
+        channel_padded[:padded_height, :padded_width] = channel
+        spectrum = cv2.dft(channel_padded, flags=cv2.DFT_COMPLEX_OUTPUT)
+
+        # Multiplying by the conjugate correlates instead of convolving
+        filtered = cv2.idft(
+            cv2.mulSpectrums(spectrum, kernel_spectrum, 0, conjB=True),
+            flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+        filtered_channels.append(filtered[:height, :width])
+
+    filtered = (cv2.merge(filtered_channels) if img.ndim == 3
+                else filtered_channels[0])
+    if np.issubdtype(img.dtype, np.integer):
+        limits = np.iinfo(img.dtype)
+        filtered = np.clip(np.rint(filtered), limits.min, limits.max)
+    return filtered.astype(img.dtype)
+
+
+def select_filter_method(kernel: np.ndarray) -> FilterMethod:
+    """Pick the fastest filtering strategy for a kernel."""
+    size = max(kernel.shape)
+    if is_box_kernel(kernel):
+        return FilterMethod.BOX
+    if size <= SEPARABLE_MAX_SIZE and split_separable_kernel(kernel):
+        return FilterMethod.SEPARABLE
+    return FilterMethod.DENSE
+
+
+def filter_2d(img: ImageType, kernel: np.ndarray,
+              method: FilterMethod = FilterMethod.AUTO) -> ImageType:
+    """
+    Apply a 2D convolution filter to the image.
+
+    With ``FilterMethod.AUTO``, box kernels use running sums and small
+    rank-1 kernels two 1D passes. Fast path results may differ
+    from the dense filter by one intensity level due to rounding.
+    """
     validations.validate_2d_filter_kernel(kernel)
+    validations.validate_filter_method(method)
+
+    if method == FilterMethod.AUTO:
+        method = select_filter_method(kernel)
+
+    if method == FilterMethod.BOX:
+        if not is_box_kernel(kernel):
+            raise ValueError("Kernel is not a normalized box kernel.")
+        kernel_height, kernel_width = kernel.shape
+        return cv2.boxFilter(img, -1, (kernel_width, kernel_height))
+
+    if method == FilterMethod.SEPARABLE:
+        kernels = split_separable_kernel(kernel)
+        if kernels is None:
+            raise ValueError("Kernel is not separable.")
+        column_kernel, row_kernel = kernels
+        return cv2.sepFilter2D(img, -1, row_kernel, column_kernel)
+
+    if method == FilterMethod.DFT:
+        return filter_2d_dft(img, kernel)
+
     return cv2.filter2D(img, -1, kernel)
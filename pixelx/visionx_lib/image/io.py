@@ -1,15 +1,87 @@
 # pixelx/visionx_lib/image/io.py
 
+import struct
+
 from pixelx.visionx_lib.image import convert_bgr2rgb
 from pixelx.visionx_lib.core import validations
-from pixelx.visionx_lib.core.base import cv2, Path, ImageType, plt
+from pixelx.visionx_lib.core.base import cv2, np, Path, ImageType, plt
+
+
+# Reduced decode flags by downscale factor, largest factor first
+REDUCED_COLOR_FLAGS = {8: cv2.IMREAD_REDUCED_COLOR_8,
+                       4: cv2.IMREAD_REDUCED_COLOR_4,
+                       2: cv2.IMREAD_REDUCED_COLOR_2}
+REDUCED_GRAYSCALE_FLAGS = {8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+                           4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+                           2: cv2.IMREAD_REDUCED_GRAYSCALE_2}
+
+# Start-of-frame markers carrying the JPEG dimensions
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def read_jpeg_dimensions(buffer: bytes) -> tuple[int, int] | None:
+    """Return the width and height from a JPEG header, or None if not JPEG."""
+    if buffer[:2] != b"\xff\xd8":
+        return None
+
+    offset = 2
+    while offset + 9 <= len(buffer):
+        if buffer[offset] != 0xFF:
+            return None
 
+        marker = buffer[offset + 1]
+        if marker == 0xFF:  # Fill byte
+            offset += 1
+        elif marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", buffer[offset + 5:offset + 9])
+            return width, height
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD7:  # No payload
+            offset += 2
+        else:
+            length, = struct.unpack(">H", buffer[offset + 2:offset + 4])
+            offset += 2 + length
+    return None
 
-def load_image(image_path: str) -> ImageType:
-    """Load an image from a file path."""
+
+def get_decode_flag(buffer: bytes, target_width: int | None = None,
+                    grayscale: bool = False) -> int:
+    """
+    Pick the decode flag for an image so that JPEG decoders downscale by
+    the largest factor still at least ``target_width`` wide.
+    """
+    default_flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+    if target_width is None:
+        return default_flag
+
+    validations.validate_dimensions(target_width, 1)  # Width only
+    dimensions = read_jpeg_dimensions(buffer)
+    if dimensions is None:
+        return default_flag
+
+    width, _ = dimensions
+    flags = REDUCED_GRAYSCALE_FLAGS if grayscale else REDUCED_COLOR_FLAGS
+    for factor, flag in flags.items():
+        if width / factor >= target_width:
+            return flag
+    return default_flag
+
+
+def load_image(image_path: str, target_width: int | None = None,
+               grayscale: bool = False) -> ImageType:
+    """
+    Load an image from a file path.
+
+    With a ``target_width``, JPEG images are decoded at a reduced
+    resolution that is still at least that wide.
+    """
     if not isinstance(image_path, str) or not image_path:
         raise ValueError("Input image path must be a non-empty string.")
 
+    if target_width is not None or grayscale:
+        return decode_image(read_image_bytes(image_path), image_path,
+                            target_width, grayscale)
+
     # Load the image
     image = cv2.imread(image_path)
 
@@ -19,6 +91,37 @@ def load_image(image_path: str) -> ImageType:
     return image
 
 
+def read_image_bytes(image_path: str) -> bytes:
+    """Read the encoded bytes of an image file."""
+    if not isinstance(image_path, str) or not image_path:
+        raise ValueError("Input image path must be a non-empty string.")
+
+    with open(image_path, "rb") as file:
+        return file.read()
+
+
+def decode_image(buffer: bytes, image_path: str = "<buffer>",
+                 target_width: int | None = None,
+                 grayscale: bool = False) -> ImageType:
+    """Decode an image from its encoded bytes."""
+    flag = get_decode_flag(buffer, target_width, grayscale)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    image = cv2.imdecode(data, flag)
+
+    # EXIF rotation can make a reduced image narrower than the target
+    if (image is not None and target_width is not None
+            and image.shape[1] < target_width
+            and flag in (*REDUCED_COLOR_FLAGS.values(),
+                         *REDUCED_GRAYSCALE_FLAGS.values())):
+        image = cv2.imdecode(
+            data, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
+
+    # Validate image
+    validations.validate_image(image, image_path)
+
+    return image
+
+
 def save_image(image: ImageType, output_path: str) -> bool:
     """Save an image to a file path."""
     validations.validate_image(image, output_path)
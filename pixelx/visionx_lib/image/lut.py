@@ -0,0 +1,92 @@
+# pixelx/visionx_lib/image/lut.py
+
+from functools import lru_cache
+
+from pixelx.visionx_lib.core import validations
+from pixelx.visionx_lib.core.base import cv2, np, ImageType
+
+# Number of tables kept per builder, so repeated parameters reuse them
+LUT_CACHE_SIZE = 64
+
+
+def finalize_table(values: np.ndarray) -> np.ndarray:
+    """Round and saturate table values to uint8 and make them read-only."""
+    table = np.clip(np.rint(values), 0, 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def threshold_lut(thresh: int, maxval: int = 255) -> np.ndarray:
+    """Return the table of a binary threshold, like ``cv2.THRESH_BINARY``."""
+    validations.validate_threshold_values(thresh, maxval)
+    return finalize_table(np.where(np.arange(256) > thresh, maxval, 0))
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def gamma_lut(gamma: float) -> np.ndarray:
+    """Return the table of a gamma correction; above 1 brightens."""
+    if not isinstance(gamma, (int, float)) or gamma <= 0:
+        raise ValueError("Gamma must be a positive number.")
+    return finalize_table(255 * (np.arange(256) / 255) ** (1 / gamma))
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def contrast_lut(alpha: float, beta: float = 0.0) -> np.ndarray:
+    """Return the table of ``alpha * value + beta``."""
+    return finalize_table(alpha * np.arange(256) + beta)
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def blend_constant_lut(alpha: float, constant: int, beta: float,
+                       gamma: float = 0.0) -> np.ndarray:
+    """
+    Return the table of blending with a constant image, like
+    ``cv2.addWeighted(image, alpha, constant, beta, gamma)``.
+    """
+    return finalize_table(alpha * np.arange(256) + beta * constant + gamma)
+
+
+LUT_BUILDERS = {
+    "threshold": threshold_lut,
+    "gamma": gamma_lut,
+    "contrast": contrast_lut,
+    "blend": blend_constant_lut
+}
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def compile_point_operations(operations: tuple[tuple, ...]) -> np.ndarray:
+    """
+    Compose point operations, each a builder name followed by its
+    arguments, into a single table applying them in order.
+    """
+    table = np.arange(256, dtype=np.uint8)
+    for name, *args in operations:
+        if name not in LUT_BUILDERS:
+            raise ValueError(f"Unsupported point operation: {name}")
+        table = LUT_BUILDERS[name](*args)[table]
+
+    table.flags.writeable = False
+    return table
+
+
+def apply_lut(image: ImageType, table: np.ndarray) -> ImageType:
+    """Map every pixel of a uint8 image through a 256 entry table."""
+    if image.dtype != np.uint8:
+        raise TypeError("Lookup tables only apply to uint8 images.")
+    return cv2.LUT(image, table)
+
+
+def apply_point_operations(image: ImageType,
+                           operations: list | tuple) -> ImageType:
+    """
+    Apply consecutive point operations, such as
+    ``[["gamma", 1.5], ["contrast", 1.2, -10]]``, in a single table pass.
+    """
+    if not operations:
+        return image
+
+    # Lists from the config are not hashable
+    operations = tuple(tuple(operation) for operation in operations)
+    return apply_lut(image, compile_point_operations(operations))
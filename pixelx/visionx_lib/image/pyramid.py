@@ -0,0 +1,62 @@
+# pixelx/visionx_lib/image/pyramid.py
+
+from pixelx.visionx_lib.core.base import cv2, ImageType
+from pixelx.visionx_lib.image.color_conversion import ensure_grayscale
+from pixelx.visionx_lib.image.resize import resize_by_aspect_ratio
+
+
+class ImagePyramid:
+    """
+    Lazily computed resized and grayscale variants of one image, shared
+    by every stage that processes it.
+
+    Each variant is computed from the original image the first time it
+    is requested and cached, so stages asking for the same scale and
+    format get the same array instead of resizing again. Cached arrays
+    are shared and must not be modified in place.
+    """
+
+    def __init__(self, image: ImageType):
+        self.image = image
+        self.variants: dict[tuple, ImageType] = {}
+        self.levels: list[ImageType] = [image]
+
+    @classmethod
+    def wrap(cls, image: "ImageType | ImagePyramid") -> "ImagePyramid":
+        """Return the given pyramid, or a new pyramid of an image."""
+        return image if isinstance(image, cls) else cls(image)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Return the shape of the original image."""
+        return self.image.shape
+
+    def resized(self, width: int | None = None, height: int | None = None,
+                interpolation: int = cv2.INTER_LINEAR) -> ImageType:
+        """
+        Return the image resized to a width or height keeping its aspect
+        ratio, or the original image if neither is given.
+        """
+        if width is None and height is None:
+            return self.image
+
+        key = ("color", width, height, interpolation)
+        if key not in self.variants:
+            self.variants[key] = resize_by_aspect_ratio(
+                self.image, width, height, interpolation=interpolation)
+        return self.variants[key]
+
+    def grayscale(self, width: int | None = None, height: int | None = None,
+                  interpolation: int = cv2.INTER_LINEAR) -> ImageType:
+        """Return the grayscale version of a resized variant."""
+        key = ("grayscale", width, height, interpolation)
+        if key not in self.variants:
+            self.variants[key] = ensure_grayscale(
+                self.resized(width, height, interpolation))
+        return self.variants[key]
+
+    def level(self, index: int) -> ImageType:
+        """Return a Gaussian pyramid level, halving the size per level."""
+        while len(self.levels) <= index:
+            self.levels.append(cv2.pyrDown(self.levels[-1]))
+        return self.levels[index]
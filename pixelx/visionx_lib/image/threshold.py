@@ -27,3 +27,19 @@ def apply_adaptive_threshold(img: ImageType, max_value: int = 255,
     return cv2.adaptiveThreshold(
         img, max_value, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY, block_size, c)
+
+
+def apply_color_range_mask(
+        image: ImageType,
+        ranges: list[tuple[list[int], list[int]]]) -> ImageType:
+    """
+    Return the mask of the pixels of a 3-channel image lying within any
+    of the given per-channel (lower, upper) ranges.
+    """
+    mask = None
+    for lower, upper in ranges:
+        validations.validate_channel_range(lower, upper)
+        range_mask = cv2.inRange(image, np.array(lower), np.array(upper))
+        mask = range_mask if mask is None else cv2.bitwise_or(mask,
+                                                              range_mask)
+    return mask
@@ -0,0 +1,155 @@
+# pixelx/visionx_lib/image/tiling.py
+
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from pixelx.visionx_lib.core import validations
+from pixelx.visionx_lib.core.base import np, os, ImageType
+from pixelx.visionx_lib.image.edge_detection import \
+    apply_canny_edge_detection, compute_canny_thresholds
+from pixelx.visionx_lib.image.filters import apply_gaussian_blur
+from pixelx.visionx_lib.image.threshold import apply_threshold
+
+# Default halo of Canny: the Sobel aperture and non-maximum suppression
+# need 2 pixels, the rest lets hysteresis follow most edges across tile
+# borders (it can follow weak edges any distance, so no halo is exact)
+CANNY_HALO = 16
+
+
+def open_image_memmap(path: str, mode: str = "r") -> np.memmap:
+    """Open a ``.npy`` image as a memory map, without reading it."""
+    return np.load(path, mmap_mode=mode)
+
+
+def create_image_memmap(path: str, shape: tuple[int, ...],
+                        dtype: np.dtype = np.uint8) -> np.memmap:
+    """Create a ``.npy`` image on disk and return it as a memory map."""
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                     shape=shape)
+
+
+def iter_tiles(height: int, width: int, tile_size: int):
+    """Yield the (top, left, bottom, right) boxes covering an image."""
+    for top in range(0, height, tile_size):
+        for left in range(0, width, tile_size):
+            yield (top, left, min(top + tile_size, height),
+                   min(left + tile_size, width))
+
+
+def process_tile(image: ImageType, function: callable,
+                 box: tuple[int, int, int, int], halo: int) -> ImageType:
+    """
+    Apply a function to a tile extended by the halo, and return the
+    output cropped back to the tile.
+    """
+    top, left, bottom, right = box
+    height, width = image.shape[:2]
+    outer_top, outer_left = max(0, top - halo), max(0, left - halo)
+    outer_bottom = min(height, bottom + halo)
+    outer_right = min(width, right + halo)
+
+    # Only this window is read from a memory-mapped image
+    tile = np.ascontiguousarray(
+        image[outer_top:outer_bottom, outer_left:outer_right])
+    processed = function(tile)
+    return processed[top - outer_top:bottom - outer_top,
+                     left - outer_left:right - outer_left]
+
+
+def process_tiled(image: ImageType, function: callable, halo: int = 0,
+                  tile_size: int = 1024, workers: int | None = None,
+                  output: ImageType | str | None = None) -> ImageType:
+    """
+    Apply a function to an image tile by tile on a thread pool.
+
+    Each tile is extended by ``halo`` pixels, which must cover the reach
+    of the function (e.g. the kernel radius of a filter) for the output
+    to be seamless. Tiles at the image border are not extended past it,
+    so the function applies its own border handling as on the whole
+    image. The image may be a memory map; at most two tiles per worker
+    are held in memory, and the output is written to ``output``, to a
+    new ``.npy`` memory map if it is a path, or to a new array.
+    """
+    validations.validate_tile_params(tile_size, halo)
+    workers = workers or os.cpu_count() or 1
+    height, width = image.shape[:2]
+
+    def write_tile(box, processed):
+        nonlocal output
+        if not isinstance(output, np.ndarray):
+            shape = (height, width, *processed.shape[2:])
+            output = (np.empty(shape, processed.dtype) if output is None
+                      else create_image_memmap(output, shape,
+                                               processed.dtype))
+
+        top, left, bottom, right = box
+        output[top:bottom, left:right] = processed
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for box in iter_tiles(height, width, tile_size):
+            if len(pending) == 2 * workers:
+                done_box, future = pending.popleft()
+                write_tile(done_box, future.result())
+            pending.append((box, executor.submit(process_tile, image,
+                                                 function, box, halo)))
+
+        while pending:
+            done_box, future = pending.popleft()
+            write_tile(done_box, future.result())
+
+    if isinstance(output, np.memmap):
+        output.flush()
+    return output
+
+
+def estimate_median(image: ImageType, samples: int = 1_000_000) -> float:
+    """Estimate the median intensity from a strided sample of the image."""
+    step = max(1, math.isqrt(image.shape[0] * image.shape[1] // samples))
+    return float(np.median(image[::step, ::step]))
+
+
+def tiled_gaussian_blur(image: ImageType,
+                        kernel_size: list[int, int],
+                        deviation: float = 0, **tile_options) -> ImageType:
+    """Apply Gaussian blur tile by tile, with a halo of the kernel radius."""
+    return process_tiled(
+        image, partial(apply_gaussian_blur, kernel_size=kernel_size,
+                       deviation=deviation), max(kernel_size) // 2,
+        **tile_options)
+
+
+def tiled_canny_edge_detection(
+        image: ImageType, threshold_lower: int | None = None,
+        threshold_higher: int | None = None, sigma: float | None = 0.3,
+        halo: int = CANNY_HALO, **tile_options) -> ImageType:
+    """
+    Perform Canny edge detection tile by tile. Automatic thresholds are
+    computed once from the median of the whole image, so that every tile
+    uses the same ones.
+
+    The result is approximate near tile seams: hysteresis keeps weak
+    edges connected to strong ones at any distance, so a weak edge whose
+    strong part lies beyond the ``halo`` of a tile can differ from the
+    whole-image result. A larger ``halo`` makes this rarer at the cost of
+    more overlap.
+    """
+    if not threshold_lower and not threshold_higher:
+        threshold_lower, threshold_higher = compute_canny_thresholds(
+            estimate_median(image), sigma)
+
+    return process_tiled(
+        image, partial(apply_canny_edge_detection,
+                       threshold_lower=threshold_lower,
+                       threshold_higher=threshold_higher), halo,
+        **tile_options)
+
+
+def tiled_threshold(image: ImageType, thresh: int = 127, maxval: int = 255,
+                    **tile_options) -> ImageType:
+    """Apply binary thresholding tile by tile."""
+    return process_tiled(
+        image, partial(apply_threshold, thresh=thresh, maxval=maxval), 0,
+        **tile_options)
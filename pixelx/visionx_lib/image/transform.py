@@ -1,9 +1,21 @@
 # pixelx/visionx_lib/image/transform.py
 
+from functools import lru_cache
+
 from pixelx.visionx_lib.core import validations
 from pixelx.visionx_lib.core.base import cv2, np, ImageType
 from pixelx.visionx_lib.core.enums import FlipType, RotateType
 
+# Lossless rotations by exact multiples of 90 degrees, by clockwise angle
+ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE
+}
+
+# Remap maps kept for transforms applied repeatedly at the same size
+REMAP_CACHE_SIZE = 16
+
 
 def flip_image(img: ImageType, flip_type: FlipType) -> ImageType:
     """Flip the image horizontally, vertically, or both."""
@@ -28,20 +40,15 @@ def compute_new_bounding_box(rotation_matrix: ImageType, width: int,
     return new_width, new_height
 
 
-def rotate_center(img: ImageType, rotate_type: RotateType,
-                  clockwise: bool = True, scale: float = 1.0) -> ImageType:
-    """Rotate the image around its center by a specified angle."""
-    validations.validate_rotation_type(rotate_type)
-    validations.validate_clockwise_rotation(clockwise)
-    validations.validate_scale(scale)
-
-    # Get image dimensions
-    (height, width) = img.shape[:2]
+@lru_cache(maxsize=64)
+def get_rotation_transform(width: int, height: int, angle: float,
+                           scale: float) -> tuple[np.ndarray, tuple]:
+    """
+    Return the matrix rotating an image around its center into its new
+    bounding box, and the bounding box size.
+    """
     center = (width // 2, height // 2)
 
-    # Rotate the image
-    angle = -rotate_type.value if clockwise else rotate_type.value
-
     # Get rotation matrix
     rotation_matrix = cv2.getRotationMatrix2D(center, angle, scale)
 
@@ -53,22 +60,97 @@ def rotate_center(img: ImageType, rotate_type: RotateType,
     rotation_matrix[0, 2] += (new_width / 2) - center[0]
     rotation_matrix[1, 2] += (new_height / 2) - center[1]
 
+    # The cached matrix is shared between calls
+    rotation_matrix.flags.writeable = False
+    return rotation_matrix, (new_width, new_height)
+
+
+def rotate_center(img: ImageType, rotate_type: RotateType,
+                  clockwise: bool = True, scale: float = 1.0) -> ImageType:
+    """Rotate the image around its center by a specified angle."""
+    validations.validate_rotation_type(rotate_type)
+    validations.validate_clockwise_rotation(clockwise)
+    validations.validate_scale(scale)
+
+    # Unscaled rotations by multiples of 90 degrees only move pixels
+    clockwise_angle = (rotate_type.value if clockwise
+                       else 360 - rotate_type.value)
+    if scale == 1.0:
+        return cv2.rotate(img, ROTATE_CODES[clockwise_angle])
+
+    # Get image dimensions
+    (height, width) = img.shape[:2]
+
+    # Rotate the image
+    angle = -rotate_type.value if clockwise else rotate_type.value
+    rotation_matrix, new_size = get_rotation_transform(
+        width, height, angle, scale)
+
     # Rotate image
-    return cv2.warpAffine(img, rotation_matrix, (new_width, new_height))
+    return cv2.warpAffine(img, rotation_matrix, new_size)
+
+
+@lru_cache(maxsize=REMAP_CACHE_SIZE)
+def build_remap_maps(matrix_key: bytes, output_size: tuple[int, int]
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build the fixed-point remap maps of an affine (2x3) or perspective
+    (3x3) matrix given as float64 bytes, for an output size.
+    """
+    matrix = np.frombuffer(matrix_key, dtype=np.float64)
+    matrix = matrix.reshape(-1, 3)
+    if matrix.shape[0] == 2:
+        matrix = np.vstack([matrix, [0.0, 0.0, 1.0]])
+    inverse = np.linalg.inv(matrix)
+
+    # Source coordinates of every output pixel
+    width, height = output_size
+    xs, ys = np.meshgrid(np.arange(width, dtype=np.float64),
+                         np.arange(height, dtype=np.float64))
+    denominator = inverse[2, 0] * xs + inverse[2, 1] * ys + inverse[2, 2]
+    map_x = (inverse[0, 0] * xs + inverse[0, 1] * ys
+             + inverse[0, 2]) / denominator
+    map_y = (inverse[1, 0] * xs + inverse[1, 1] * ys
+             + inverse[1, 2]) / denominator
+
+    return cv2.convertMaps(map_x.astype(np.float32),
+                           map_y.astype(np.float32), cv2.CV_16SC2)
+
+
+def remap_cached(img: ImageType, matrix: np.ndarray,
+                 output_size: tuple[int, int]) -> ImageType:
+    """Apply a transform matrix through remap maps cached per size."""
+    map_xy, map_interpolation = build_remap_maps(
+        np.ascontiguousarray(matrix, dtype=np.float64).tobytes(),
+        output_size)
+    return cv2.remap(img, map_xy, map_interpolation, cv2.INTER_LINEAR)
 
 
 def warp_perspective(img: ImageType, src_points: np.ndarray,
-                     dst_points: np.ndarray) -> ImageType:
-    """Apply perspective transformation to the image."""
+                     dst_points: np.ndarray,
+                     cache_maps: bool = False) -> ImageType:
+    """
+    Apply perspective transformation to the image.
+
+    With ``cache_maps``, the remap maps of the transform are built once
+    and reused by later calls with the same points and image size.
+    """
     validations.validate_perspective_points(src_points, dst_points)
 
     matrix = cv2.getPerspectiveTransform(src_points, dst_points)
-    return cv2.warpPerspective(img, matrix, (img.shape[1], img.shape[0]))
+    output_size = (img.shape[1], img.shape[0])
+    if cache_maps:
+        return remap_cached(img, matrix, output_size)
+    return cv2.warpPerspective(img, matrix, output_size)
 
 
 def apply_affine_transform(img: ImageType, matrix: np.ndarray,
-                           output_size: tuple[int, int]) -> ImageType:
-    """Apply an affine transformation to the image."""
+                           output_size: tuple[int, int],
+                           cache_maps: bool = False) -> ImageType:
+    """
+    Apply an affine transformation to the image, through cached remap
+    maps if ``cache_maps``.
+    """
     validations.validate_transformation_matrix(matrix, (2, 3))
 
     if not isinstance(output_size, tuple) or len(output_size) != 2:
@@ -77,4 +159,6 @@ def apply_affine_transform(img: ImageType, matrix: np.ndarray,
     if not all(isinstance(x, int) and x > 0 for x in output_size):
         raise ValueError("output_size values must be positive integers.")
 
+    if cache_maps:
+        return remap_cached(img, matrix, output_size)
     return cv2.warpAffine(img, matrix, output_size)
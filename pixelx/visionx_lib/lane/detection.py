@@ -1,35 +1,86 @@
 # pixelx/visionx_lib/lane/detection.py
 
+import time
+
 from pixelx.visionx_lib.core.base import cv2, ImageType
-from pixelx.visionx_lib.core.enums import MaskType
+from pixelx.visionx_lib.core.enums import MaskType, LineSide, HoughMethod, \
+    EdgeMethod
+from pixelx.visionx_lib.core.utils import get_image_dimensions
 from pixelx.visionx_lib.image import apply_gaussian_blur, \
-    convert_to_rgb2grayscale, apply_canny_edge_detection, load_image, \
-    apply_roi_mask, resize_by_aspect_ratio, apply_detect_hough_lines, \
-    display_image_plt
+    apply_canny_edge_detection, load_image, apply_roi_mask, \
+    apply_detect_hough_lines, display_image_plt, resize_by_width_height, \
+    apply_detect_hough_lines_bounded, apply_detect_hough_lines_banded, \
+    apply_detect_lsd_lines, apply_color_range_mask
+from pixelx.visionx_lib.image.color_conversion import convert_bgr2hls
+from pixelx.visionx_lib.image.lut import apply_point_operations
+from pixelx.visionx_lib.image.pyramid import ImagePyramid
 from pixelx.visionx_lib.lane.draw_lines import draw_lane
-from pixelx.visionx_lib.lane.process_lines import separate_lines, fit_lines
-
+from pixelx.visionx_lib.lane.process_lines import fit_lines
+from pixelx.visionx_lib.lane.segments import to_segments, cap_segments, \
+    select_side
 
-def preprocess_image(image: str | ImageType, width: int,
-                     height: int) -> tuple[ImageType, ImageType, ImageType]:
-    """Load an image or a frame, and return the original, grayscale and resize."""
-    # Load image
-    original_image: ImageType = load_image(
-        image) if isinstance(image, str) else image
 
-    # Resize the image
-    resize_image = resize_by_aspect_ratio(original_image, width, height)
+def preprocess_image(image: str | ImageType | ImagePyramid, width: int,
+                     height: int, point_operations: list | None = None
+                     ) -> tuple[ImageType, ImageType, ImageType]:
+    """
+    Load an image or a frame, and return the original, grayscale and resize.
 
-    # Convert the image to grayscale
-    grayscale_image = convert_to_rgb2grayscale(resize_image)
+    The ``point_operations`` (see ``apply_point_operations``) adjust the
+    intensities of the grayscale image in a single table pass.
+    """
+    # Load image
+    pyramid = ImagePyramid.wrap(
+        load_image(image) if isinstance(image, str) else image)
+
+    # Resize the image, reusing the pyramid's variant if another stage
+    # already asked for it
+    resize_image = pyramid.resized(width, height)
+
+    # Convert the image to grayscale (it may already be decoded as such)
+    grayscale_image = pyramid.grayscale(width, height)
+    if point_operations:
+        grayscale_image = apply_point_operations(grayscale_image,
+                                                 point_operations)
+
+    return pyramid.image, grayscale_image, resize_image
+
+
+def detect_color_edges(image: ImageType, white_lower: list[int],
+                       white_upper: list[int], yellow_lower: list[int],
+                       yellow_upper: list[int],
+                       display: bool = False) -> ImageType:
+    """
+    Return the binary mask of the white and yellow lane markings of a BGR
+    image, from HLS color ranges.
+    """
+    lane_mask = apply_color_range_mask(
+        convert_bgr2hls(image),
+        [(white_lower, white_upper), (yellow_lower, yellow_upper)])
 
-    return original_image, grayscale_image, resize_image
+    if display:
+        display_image_plt(lane_mask, "Lane color mask", "gray")
+    return lane_mask
 
 
 def detect_edges(image: ImageType, kernel_size: list[int, int],
                  deviation: float, threshold_lower: int, threshold_higher: int,
-                 sigma: float, display: bool = False) -> ImageType:
-    """Apply Gaussian blur followed by Canny edge detection."""
+                 sigma: float, method: str = EdgeMethod.CANNY.value,
+                 color_mask: dict | None = None,
+                 color_image: ImageType | None = None,
+                 display: bool = False) -> ImageType:
+    """
+    Apply Gaussian blur followed by Canny edge detection.
+
+    With the ``color`` method, the lane markings of ``color_image`` are
+    instead extracted with the ``color_mask`` ranges of
+    ``detect_color_edges``.
+    """
+    if method == EdgeMethod.COLOR.value:
+        return detect_color_edges(color_image, **color_mask, display=display)
+    elif method != EdgeMethod.CANNY.value:
+        raise ValueError(f"Unsupported edge method: {method}")
+
     # Apply Gaussian blur
     blurred = apply_gaussian_blur(image, kernel_size, deviation)
 
@@ -64,21 +115,58 @@ def roi_mask(image: ImageType, mask_type: MaskType, color: tuple[int, int, int],
 def detect_lane(
         image: ImageType, edge_img: ImageType, rho: int,
         theta_degrees: float, threshold: int, min_line_length: int,
-        max_line_gap: int, slope_threshold: float, hidden_frac: float
-) -> tuple | tuple[tuple[int, ...] | None, tuple[int, ...] | None]:
-    """ Detects lane lines on the given image. """
-
-    lines = apply_detect_hough_lines(
-        edge_img, rho, theta_degrees, threshold, min_line_length, max_line_gap)
+        max_line_gap: int, slope_threshold: float, hidden_frac: float,
+        max_segments: int | None = None,
+        hough_method: str = HoughMethod.PROBABILISTIC.value,
+        max_band_lines: int = 8, **fit_options
+) -> dict:
+    """
+    Detects lane lines on the given image and returns the fitted lines
+    together with the segment counts.
+
+    The ``hough_method`` selects the segment detector: ``probabilistic``
+    Hough over every angle, ``banded`` Hough restricted to the angles of
+    lines steeper than ``slope_threshold``, or ``lsd``. With
+    ``max_segments``, the probabilistic Hough threshold is raised when
+    the segment count explodes, and with any detector only the longest
+    segments on a lane side are kept.
+    The ``fit_options`` (``fit_method``, ``ransac_iterations`` and
+    ``ransac_tolerance``) select how each side is fitted.
+    """
+    if hough_method == HoughMethod.BANDED.value:
+        lines = apply_detect_hough_lines_banded(
+            edge_img, rho, theta_degrees, threshold, min_line_length,
+            max_line_gap, slope_threshold, max_band_lines)
+    elif hough_method == HoughMethod.LSD.value:
+        lines = apply_detect_lsd_lines(edge_img, min_line_length)
+    elif hough_method != HoughMethod.PROBABILISTIC.value:
+        raise ValueError(f"Unsupported Hough method: {hough_method}")
+    elif max_segments is None:
+        lines = apply_detect_hough_lines(
+            edge_img, rho, theta_degrees, threshold, min_line_length,
+            max_line_gap)
+    else:
+        lines = apply_detect_hough_lines_bounded(
+            edge_img, rho, theta_degrees, threshold, min_line_length,
+            max_line_gap, max_segments)
 
     if lines is None:
-        return ()  # Return original if no lines detected
+        # No lines detected
+        return lines_to_result((None, None), segment_counts=(0, 0, 0))
 
-    # Separate left and right lines
-    left_lines, right_lines = separate_lines(image, lines, slope_threshold)
+    # Separate left and right lines, keeping the longest segments
+    _, width = get_image_dimensions(image)
+    segments = cap_segments(to_segments(lines, width, slope_threshold),
+                            max_segments)
+    left_lines = select_side(segments, LineSide.LEFT)
+    right_lines = select_side(segments, LineSide.RIGHT)
 
     # Fit a single line for each side
-    return fit_lines(image, left_lines, right_lines, hidden_frac)
+    detected_lane = fit_lines(image, left_lines, right_lines, hidden_frac,
+                              **fit_options)
+    return lines_to_result(
+        detected_lane,
+        segment_counts=(len(lines), len(left_lines), len(right_lines)))
 
 
 def draw_detect_lane(original_image: ImageType, resize_image: ImageType,
@@ -94,8 +182,8 @@ def draw_detect_lane(original_image: ImageType, resize_image: ImageType,
         resize_image, left_line, right_line, color, thickness)
 
     # Resize the lane overlay to match the original image dimensions
-    resized_lane_overlay = resize_by_aspect_ratio(
-        lane_overlay, original_image.shape[1])
+    height, width = original_image.shape[:2]
+    resized_lane_overlay = resize_by_width_height(lane_overlay, width, height)
 
     # Blend the resized lane overlay with the original image
     final_image = cv2.addWeighted(
@@ -104,27 +192,177 @@ def draw_detect_lane(original_image: ImageType, resize_image: ImageType,
     return final_image, lane_overlay
 
 
-def process_image(image: str | ImageType,
-                  config_params: tuple[dict, ...],
-                  display: bool = False) -> tuple[ImageType, ImageType]:
-    """ Process an image to detect and visualize lanes. """
-
+def lines_to_result(detected_lane: tuple,
+                    segment_counts: tuple[int, int, int] = (0, 0, 0)) -> dict:
+    """Convert the detected lane lines into a serializable result."""
+    left_line, right_line = detected_lane
+    segments, left_segments, right_segments = segment_counts
+    return {
+        "left_line": None if left_line is None else list(left_line),
+        "right_line": None if right_line is None else list(right_line),
+        "segments": int(segments),
+        "left_segments": int(left_segments),
+        "right_segments": int(right_segments)
+    }
+
+
+def result_to_lines(result: dict) -> tuple:
+    """Convert a detection result back into lane lines."""
+    left_line, right_line = result["left_line"], result["right_line"]
+    return (None if left_line is None else tuple(left_line),
+            None if right_line is None else tuple(right_line))
+
+
+def record_timing(timings: dict, stage: str, start: float) -> float:
+    """Record the elapsed milliseconds of a stage and return the current time."""
+    now = time.perf_counter()
+    timings[stage] = round((now - start) * 1000, 3)
+    return now
+
+
+def scale_config_params(config_params: tuple[dict, ...],
+                        scale: float) -> tuple[dict, ...]:
+    """
+    Return config params processing at a fraction of the configured
+    resolution, scaling the pixel-based Hough parameters accordingly.
+    """
     (preprocess_config, edge_config, mask_config, detect_config,
      draw_config) = config_params
 
+    def scale_value(value):
+        return None if value is None else max(1, int(value * scale))
+
+    scaled_preprocess = {
+        **preprocess_config,
+        "width": scale_value(preprocess_config["width"]),
+        "height": scale_value(preprocess_config["height"])
+    }
+    scaled_detect = {
+        **detect_config,
+        **{key: scale_value(detect_config[key]) for key in
+           ("threshold", "min_line_length", "max_line_gap")},
+        **({"ransac_tolerance": detect_config["ransac_tolerance"] * scale}
+           if "ransac_tolerance" in detect_config else {})
+    }
+    return (scaled_preprocess, edge_config, mask_config, scaled_detect,
+            draw_config)
+
+
+def scale_result(result: dict, factor: float) -> dict:
+    """Return a result with its line coordinates multiplied by a factor."""
+    scaled = dict(result)
+    for key in ("left_line", "right_line"):
+        if result[key] is not None:
+            scaled[key] = [int(round(value * factor)) for value in result[key]]
+    return scaled
+
+
+def detect_image(image: str | ImageType | ImagePyramid,
+                 config_params: tuple[dict, ...],
+                 display: bool = False, scale: float = 1.0
+                 ) -> tuple[ImageType, ImageType | None, dict]:
+    """
+    Detect lanes in an image and return the original image, the resized
+    image and the detection result.
+
+    With a ``scale`` below 1 the image is processed at a lower resolution;
+    the result is still expressed at the configured resolution, and no
+    resized image is returned. Passing an ``ImagePyramid`` shares the
+    resized variants with the stages that render the result.
+    """
+    if scale != 1.0:
+        original_image, _, result = detect_image(
+            image, scale_config_params(config_params, scale), display)
+        return original_image, None, scale_result(result, 1 / scale)
+
+    preprocess_config, edge_config, mask_config, detect_config, _ = \
+        config_params
+    timings = {}
+    start = stage_start = time.perf_counter()
+
     # Load, resize and convert image to grayscale
     original_image, grayscale_image, resize_image = preprocess_image(
         image, **preprocess_config)
+    stage_start = record_timing(timings, "preprocess", stage_start)
 
     # Apply edges detection
-    edges = detect_edges(grayscale_image, **edge_config, display=display)
+    edges = detect_edges(grayscale_image, **edge_config,
+                         color_image=resize_image, display=display)
+    stage_start = record_timing(timings, "edges", stage_start)
 
     # Get and apply roi mask
     masked_edges = roi_mask(edges, **mask_config, display=display)
+    stage_start = record_timing(timings, "roi", stage_start)
 
     # Detect lane lines
-    detected_lane = detect_lane(resize_image, masked_edges, **detect_config)
+    result = detect_lane(resize_image, masked_edges, **detect_config)
+    record_timing(timings, "lane", stage_start)
+    record_timing(timings, "total", start)
+
+    result["timings"] = timings
+    return original_image, resize_image, result
+
+
+def render_result(original_image: ImageType | ImagePyramid, result: dict,
+                  config_params: tuple[dict, ...],
+                  resize_image: ImageType | None = None
+                  ) -> tuple[ImageType, ImageType]:
+    """Draw a detection result on the original image."""
+    preprocess_config, _, _, _, draw_config = config_params
+    pyramid = ImagePyramid.wrap(original_image)
+
+    # The overlay is drawn at the processing resolution
+    if resize_image is None:
+        resize_image = pyramid.resized(preprocess_config["width"],
+                                       preprocess_config["height"])
+
+    return draw_detect_lane(pyramid.image, resize_image,
+                            result_to_lines(result), **draw_config)
+
+
+def process_image(image: str | ImageType,
+                  config_params: tuple[dict, ...],
+                  display: bool = False) -> tuple[ImageType, ImageType]:
+    """ Process an image to detect and visualize lanes. """
+    original_image, resize_image, result = detect_image(
+        image, config_params, display)
 
     # Draw lane lines and return overlay and mask image
-    return draw_detect_lane(
-        original_image, resize_image, detected_lane, **draw_config)
+    return render_result(original_image, result, config_params, resize_image)
+
+
+def process_frame(frame: ImageType, config_params: tuple[dict, ...],
+                  display: bool = False, scale: float = 1.0,
+                  reuse_result: dict | None = None,
+                  pyramid: ImagePyramid | None = None
+                  ) -> tuple[ImageType, dict]:
+    """
+    Process a video frame and return the rendered frame and the result.
+
+    A ``reuse_result`` skips detection and draws that result instead. A
+    ``pyramid`` of the frame shares its resized variants with other
+    stages.
+    """
+    pyramid = pyramid or ImagePyramid(frame)
+    if reuse_result is not None:
+        processed_frame, _ = render_result(pyramid, reuse_result,
+                                           config_params)
+        return processed_frame, reuse_result
+
+    _, _, result = detect_image(pyramid, config_params, display, scale)
+
+    processed_frame, _ = render_result(pyramid, result, config_params)
+    return processed_frame, result
+
+
+def detect_frame(frame: ImageType, config_params: tuple[dict, ...],
+                 display: bool = False, scale: float = 1.0,
+                 reuse_result: dict | None = None,
+                 pyramid: ImagePyramid | None = None) -> tuple[None, dict]:
+    """Detect lanes in a video frame without rendering an overlay."""
+    if reuse_result is not None:
+        return None, reuse_result
+
+    _, _, result = detect_image(pyramid or frame, config_params, display,
+                                scale)
+    return None, result
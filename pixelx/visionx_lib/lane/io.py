@@ -0,0 +1,68 @@
+# pixelx/visionx_lib/lane/io.py
+
+from pixelx.visionx_lib.core.base import np, json, Path
+
+RESULT_FORMATS = ("jsonl", "npz")
+
+
+def save_results_jsonl(results: list[dict], output_path: str) -> None:
+    """Save detection results as JSON Lines, one result per frame."""
+    with open(output_path, "w") as file:
+        for result in results:
+            file.write(json.dumps(result, separators=(",", ":")))
+            file.write("\n")
+
+
+def load_results_jsonl(input_path: str) -> list[dict]:
+    """Load detection results saved as JSON Lines."""
+    with open(input_path, "r") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def lines_to_array(results: list[dict], key: str) -> np.ndarray:
+    """Stack a line column into an (N, 4) array, using -1 for missing lines."""
+    lines = np.full((len(results), 4), -1, dtype=np.int32)
+    for index, result in enumerate(results):
+        if result[key] is not None:
+            lines[index] = result[key]
+    return lines
+
+
+def save_results_npz(results: list[dict], output_path: str) -> None:
+    """Save detection results as a columnar NumPy ``.npz`` file."""
+    columns = {
+        "frame": np.array([result.get("frame", index)
+                           for index, result in enumerate(results)],
+                          dtype=np.int32),
+        "left_line": lines_to_array(results, "left_line"),
+        "right_line": lines_to_array(results, "right_line"),
+    }
+
+    for key in ("segments", "left_segments", "right_segments"):
+        columns[key] = np.array([result.get(key, 0) for result in results],
+                                dtype=np.int32)
+
+    stages = results[0].get("timings", {}).keys() if results else ()
+    for stage in stages:
+        columns[f"timing_{stage}"] = np.array(
+            [result["timings"][stage] for result in results], dtype=np.float32)
+
+    np.savez_compressed(output_path, **columns)
+
+
+def save_results(results: list[dict], output_path: str,
+                 result_format: str = "jsonl") -> str:
+    """Save detection results in the given format and return the path."""
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unsupported result format: {result_format}")
+
+    # Ensure the output directory exists; the extension is appended so
+    # inputs differing only by extension get separate results
+    output_file = Path(f"{output_path}.{result_format}")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if result_format == "jsonl":
+        save_results_jsonl(results, str(output_file))
+    else:
+        save_results_npz(results, str(output_file))
+    return str(output_file)
@@ -2,71 +2,144 @@
 
 from pixelx.visionx_lib.core import utils
 from pixelx.visionx_lib.core.base import np, ImageType
+from pixelx.visionx_lib.core.enums import LineSide, FitMethod
+from pixelx.visionx_lib.lane.segments import to_segments, select_side
+
+# Number of segments tried as line hypotheses by the RANSAC fit, and the
+# horizontal distance in pixels within which an endpoint supports one
+RANSAC_ITERATIONS = 32
+RANSAC_TOLERANCE = 20.0
 
 
 def separate_lines(
         image: ImageType, lines: np.ndarray,
         slope_threshold: float) -> tuple[np.ndarray, np.ndarray]:
     """Separates detected lines into left and right lane lines based on slope."""
+    _, width = utils.get_image_dimensions(image)
+    segments = to_segments(lines, width, slope_threshold)
+    return (select_side(segments, LineSide.LEFT),
+            select_side(segments, LineSide.RIGHT))
 
-    # Return empty lists if no lines are detected
-    if lines is None or len(lines) == 0:
-        return np.empty((0, 4), dtype=int), np.empty((0, 4), dtype=int)
 
-    left_lines, right_lines = [], []
-    _, width = utils.get_image_dimensions(image)
-    center_x = width // 2  # Center of the image
+def extract_coordinates_from_lines(
+        lines: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Extracts all x and y coordinates from multiple detected lines."""
+    coordinates = np.asarray(lines).reshape(-1, 4)
+    return coordinates[:, [0, 2]].ravel(), coordinates[:, [1, 3]].ravel()
 
-    for line in lines:
-        # Unpack the line coordinates
-        x1, y1, x2, y2 = line.flatten()
-        slope = utils.calculate_slope(line)
 
-        # Ignore near-horizontal lines
-        if abs(slope) < slope_threshold:
-            continue
+def fit_weighted(x_coords: np.ndarray, y_coords: np.ndarray,
+                 weights: np.ndarray) -> tuple[float, float] | None:
+    """Fits x = slope * y + intercept by weighted least squares."""
+    total = weights.sum()
+    if total <= 0:
+        return None
 
-        # Separate left and right lines
-        if slope < 0 and x1 < center_x and x2 < center_x:
-            left_lines.append([x1, y1, x2, y2])
-        elif slope > 0 and x1 > center_x and x2 > center_x:
-            right_lines.append([x1, y1, x2, y2])
+    x_mean = (weights * x_coords).sum() / total
+    y_mean = (weights * y_coords).sum() / total
+    y_offsets = y_coords - y_mean
+    variance = (weights * y_offsets ** 2).sum()
+    if variance == 0:
+        return None  # All points on one row
 
-    return np.array(left_lines), np.array(right_lines)
+    slope = (weights * y_offsets * (x_coords - x_mean)).sum() / variance
+    return slope, x_mean - slope * y_mean
 
 
-def extract_coordinates_from_lines(
-        lines: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    """Extracts all x and y coordinates from multiple detected lines."""
-    all_x_coords, all_y_coords = [], []
+def fit_segments_weighted(lines: np.ndarray) -> tuple[float, float] | None:
+    """Fits a line to segment endpoints weighted by the segment length."""
+    coordinates = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+    lengths = np.hypot(coordinates[:, 2] - coordinates[:, 0],
+                       coordinates[:, 3] - coordinates[:, 1])
+    x_coords, y_coords = extract_coordinates_from_lines(coordinates)
+    return fit_weighted(x_coords, y_coords, np.repeat(lengths, 2))
 
-    for line in lines:
-        x_coords, y_coords = utils.split_line_coordinates(line)
-        all_x_coords.extend(x_coords)
-        all_y_coords.extend(y_coords)
 
-    return np.array(all_x_coords), np.array(all_y_coords)
+def fit_segments_ransac(lines: np.ndarray,
+                        iterations: int = RANSAC_ITERATIONS,
+                        tolerance: float = RANSAC_TOLERANCE
+                        ) -> tuple[float, float] | None:
+    """
+    Fits a line with RANSAC, using segments as the line hypotheses.
+
+    Up to ``iterations`` segments, sampled by length, are scored at once
+    by the number of segments whose endpoints both lie within
+    ``tolerance`` pixels of them, ties going to the longest support. The
+    winning inliers are then refitted with ``fit_segments_weighted``.
+    """
+    coordinates = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = coordinates.T
+    lengths = np.hypot(x2 - x1, y2 - y1)
+
+    # Horizontal segments cannot define x as a function of y
+    candidates = np.flatnonzero(y2 != y1)
+    if candidates.size == 0:
+        return None
+    if candidates.size > iterations:
+        # A fixed seed keeps the fit reproducible
+        weights = lengths[candidates] / lengths[candidates].sum()
+        candidates = np.random.default_rng(0).choice(
+            candidates, iterations, replace=False, p=weights)
+
+    slopes = (x2 - x1)[candidates] / (y2 - y1)[candidates]
+    intercepts = x1[candidates] - slopes * y1[candidates]
+
+    # Horizontal distances of the endpoints to every hypothesis, (H, N)
+    start_errors = np.abs(slopes[:, None] * y1 + intercepts[:, None] - x1)
+    end_errors = np.abs(slopes[:, None] * y2 + intercepts[:, None] - x2)
+    inliers = (start_errors <= tolerance) & (end_errors <= tolerance)
+
+    # Most supporting segments first, then most supporting length
+    best = np.lexsort((inliers @ lengths, inliers.sum(axis=1)))[-1]
+    return fit_segments_weighted(coordinates[inliers[best]])
 
 
 def approximate_line(image: ImageType,
                      detected_lines: np.ndarray,
-                     hidden_frac: float) -> tuple[int, ...] | None:
-    """Fits a single line using linear regression."""
+                     hidden_frac: float,
+                     fit_method: str = FitMethod.LEAST_SQUARES.value,
+                     ransac_iterations: int = RANSAC_ITERATIONS,
+                     ransac_tolerance: float = RANSAC_TOLERANCE
+                     ) -> tuple[int, ...] | None:
+    """
+    Fits a single line to the detected segments.
+
+    ``least_squares`` fits every endpoint equally, ``weighted`` weights
+    the endpoints by the length of their segment, and ``ransac`` ignores
+    segments far from the best supported line.
+    """
     if detected_lines is None or len(detected_lines) == 0:
         return None  # No sufficient lines detected
 
     height, width = utils.get_image_dimensions(image)
 
-    # Extract x and y coordinates
-    x_coords, y_coords = extract_coordinates_from_lines(detected_lines)
+    if fit_method == FitMethod.LEAST_SQUARES.value:
+        # Extract x and y coordinates
+        x_coords, y_coords = extract_coordinates_from_lines(detected_lines)
+
+        if x_coords.size < 2 or y_coords.size < 2:
+            return None
+
+        # Fit a line to the points (y = mx + b)
+        # Reverse xy (Vertical lines)
+        # TODO: update np.polyfit to np.polynomial.Polynomial.fit
+        slope, intercept = np.polyfit(y_coords, x_coords, 1)
 
-    if x_coords.size < 2 or y_coords.size < 2:
-        raise None
+    elif fit_method == FitMethod.WEIGHTED.value:
+        fitted = fit_segments_weighted(detected_lines)
+        if fitted is None:
+            return None
+        slope, intercept = fitted
 
-    # Fit a line to the points (y = mx + b)
-    # Reverse xy (Vertical lines)
-    # TODO: update np.polyfit to np.polynomial.Polynomial.fit
-    slope, intercept = np.polyfit(y_coords, x_coords, 1)
+    elif fit_method == FitMethod.RANSAC.value:
+        fitted = fit_segments_ransac(detected_lines, ransac_iterations,
+                                     ransac_tolerance)
+        if fitted is None:
+            return None
+        slope, intercept = fitted
+
+    else:
+        raise ValueError(f"Unsupported fit method: {fit_method}")
 
     # Define start and end points of the fitted line
     # Hidden fraction start from the top and extend to % of the image height
@@ -80,11 +153,16 @@ def approximate_line(image: ImageType,
 def fit_lines(image: ImageType,
               left_lines: np.ndarray,
               right_lines: np.ndarray,
-              hidden_frac: float = 0.6
+              hidden_frac: float = 0.6,
+              **fit_options
               ) -> tuple[tuple[int, ...] | None, tuple[int, ...]] | None:
     """
     Approximates the left and right lane lines based on detected line segments.
+
+    The ``fit_options`` select the fit method of ``approximate_line``.
     """
-    left_line = approximate_line(image, left_lines, hidden_frac)
-    right_line = approximate_line(image, right_lines, hidden_frac)
+    left_line = approximate_line(image, left_lines, hidden_frac,
+                                 **fit_options)
+    right_line = approximate_line(image, right_lines, hidden_frac,
+                                  **fit_options)
     return left_line, right_line
@@ -0,0 +1,71 @@
+# pixelx/visionx_lib/lane/segments.py
+
+from pixelx.visionx_lib.core.base import np
+from pixelx.visionx_lib.core.enums import LineSide
+
+# Compact representation of Hough segments, one record per segment
+SEGMENT_DTYPE = np.dtype([
+    ("x1", np.int32), ("y1", np.int32), ("x2", np.int32), ("y2", np.int32),
+    ("slope", np.float32), ("length", np.float32), ("side", np.int8)
+])
+
+
+def to_segments(lines: np.ndarray | None, width: int,
+                slope_threshold: float) -> np.ndarray:
+    """
+    Convert Hough lines of shape (N, 1, 4) into a segment array, computing
+    the slope, the length and the lane side of every segment at once.
+    """
+    if lines is None or len(lines) == 0:
+        return np.empty(0, dtype=SEGMENT_DTYPE)
+
+    coordinates = lines.reshape(-1, 4)
+    segments = np.empty(len(coordinates), dtype=SEGMENT_DTYPE)
+    for column, field in enumerate(("x1", "y1", "x2", "y2")):
+        segments[field] = coordinates[:, column]
+
+    h_dist = (segments["x2"] - segments["x1"]).astype(np.float32)
+    v_dist = (segments["y2"] - segments["y1"]).astype(np.float32)
+
+    # Vertical segments get an infinite slope
+    segments["slope"] = np.divide(
+        v_dist, h_dist, where=h_dist != 0,
+        out=np.full_like(h_dist, np.inf))
+    segments["length"] = np.hypot(h_dist, v_dist)
+
+    # Near-horizontal segments and those crossing the center get no side
+    center_x = width // 2
+    steep = np.abs(segments["slope"]) >= slope_threshold
+    left = (steep & (segments["slope"] < 0) & (segments["x1"] < center_x)
+            & (segments["x2"] < center_x))
+    right = (steep & (segments["slope"] > 0) & (segments["x1"] > center_x)
+             & (segments["x2"] > center_x))
+
+    segments["side"] = LineSide.NONE.value
+    segments["side"][left] = LineSide.LEFT.value
+    segments["side"][right] = LineSide.RIGHT.value
+    return segments
+
+
+def cap_segments(segments: np.ndarray, max_segments: int | None) -> np.ndarray:
+    """
+    Keep only the ``max_segments`` longest segments on a lane side, so
+    long segments with no side (shadows, guard rails, crosswalks) cannot
+    push out the lane segments.
+    """
+    if max_segments is None:
+        return segments
+
+    segments = segments[segments["side"] != LineSide.NONE.value]
+    if len(segments) <= max_segments:
+        return segments
+
+    longest = np.argpartition(segments["length"], -max_segments)
+    return segments[longest[-max_segments:]]
+
+
+def select_side(segments: np.ndarray, side: LineSide) -> np.ndarray:
+    """Return the (N, 4) coordinates of the segments on one lane side."""
+    selected = segments[segments["side"] == side.value]
+    return np.stack([selected["x1"], selected["y1"],
+                     selected["x2"], selected["y2"]], axis=1)
@@ -0,0 +1,228 @@
+# pixelx/visionx_lib/lane/sweep.py
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pixelx.visionx_lib.config_manager import ConfigManager, \
+    fetch_processing_params
+from pixelx.visionx_lib.core.base import cv2, np, json, logging, os
+from pixelx.visionx_lib.core.enums import EdgeMethod
+from pixelx.visionx_lib.image import apply_gaussian_blur, \
+    apply_canny_edge_detection, apply_roi_mask
+from pixelx.visionx_lib.lane.detection import preprocess_image, detect_lane
+
+# Parameters swept at each stage; each stage reuses the previous output
+BLUR_KEYS = ("kernel_size", "deviation")
+CANNY_KEYS = ("threshold_lower", "threshold_higher", "sigma")
+HOUGH_KEYS = ("rho", "theta_degrees", "threshold", "min_line_length",
+              "max_line_gap", "max_segments", "slope_threshold",
+              "hidden_frac")
+
+
+def expand_grid(base_config: dict, ranges: dict,
+                keys: tuple[str, ...]) -> list[dict]:
+    """Return every combination of the swept values of the given keys."""
+    values = [ranges.get(key, [base_config[key]]) for key in keys]
+    return [dict(zip(keys, combination))
+            for combination in itertools.product(*values)]
+
+
+def build_sweep(config_params: tuple[dict, ...],
+                ranges: dict) -> tuple[list[dict], list[dict], list[dict]]:
+    """Return the blur, Canny and Hough grids of a parameter sweep."""
+    unknown = set(ranges) - set(BLUR_KEYS + CANNY_KEYS + HOUGH_KEYS)
+    if unknown:
+        raise ValueError(f"Unsupported sweep parameters: {sorted(unknown)}")
+
+    _, edge_config, _, detect_config, _ = config_params
+
+    # Only the blur and Canny edge path is swept
+    edge_method = edge_config.get("method", EdgeMethod.CANNY.value)
+    if edge_method != EdgeMethod.CANNY.value:
+        raise ValueError(f"Unsupported edge method for a sweep: "
+                         f"{edge_method}")
+
+    return (expand_grid(edge_config, ranges, BLUR_KEYS),
+            expand_grid(edge_config, ranges, CANNY_KEYS),
+            expand_grid(detect_config, ranges, HOUGH_KEYS))
+
+
+def line_error(predicted: list[int] | None,
+               labeled: list[int]) -> float:
+    """
+    Return the mean horizontal distance between a predicted line and a
+    labeled line at the labeled line's end rows, or NaN if not predicted.
+    """
+    if predicted is None:
+        return np.nan
+
+    x1, y1, x2, y2 = predicted
+    label_x1, label_y1, label_x2, label_y2 = labeled
+    inverse_slope = (x2 - x1) / (y2 - y1) if y2 != y1 else 0.0
+
+    error_start = abs(x1 + (label_y1 - y1) * inverse_slope - label_x1)
+    error_end = abs(x1 + (label_y2 - y1) * inverse_slope - label_x2)
+    return (error_start + error_end) / 2
+
+
+def evaluate_sample(image_path: str, label: dict,
+                    config_params: tuple[dict, ...],
+                    grids: tuple[list[dict], ...]
+                    ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate every swept config on one sample, sharing the blur output
+    across Canny variants and the edge maps across Hough variants.
+
+    Returns the per-config line errors (NaN when a labeled line is
+    missed, shape ``(configs, 2)``) and the per-config latency in ms.
+    """
+    cv2.setNumThreads(1)  # Parallelism comes from the process pool
+    preprocess_config, _, mask_config, detect_config, _ = config_params
+    blur_grid, canny_grid, hough_grid = grids
+    sides = [side for side in ("left_line", "right_line")
+             if label.get(side) is not None]
+
+    start = time.perf_counter()
+    _, grayscale_image, resize_image = preprocess_image(
+        image_path, **preprocess_config)
+    mask = apply_roi_mask(grayscale_image, **mask_config)
+    base_time = time.perf_counter() - start
+
+    configs = len(blur_grid) * len(canny_grid) * len(hough_grid)
+    errors = np.full((configs, 2), np.nan)
+    latencies = np.empty(configs)
+    index = 0
+
+    for blur_params in blur_grid:
+        start = time.perf_counter()
+        blurred = apply_gaussian_blur(grayscale_image, **blur_params)
+        blur_time = time.perf_counter() - start
+
+        for canny_params in canny_grid:
+            start = time.perf_counter()
+            edges = apply_canny_edge_detection(blurred, **canny_params)
+            masked_edges = cv2.bitwise_and(edges, mask)
+            edge_time = time.perf_counter() - start
+
+            for hough_params in hough_grid:
+                start = time.perf_counter()
+                result = detect_lane(resize_image, masked_edges,
+                                     **{**detect_config, **hough_params})
+                lane_time = time.perf_counter() - start
+
+                for column, side in enumerate(sides):
+                    errors[index, column] = line_error(result[side],
+                                                       label[side])
+                latencies[index] = (base_time + blur_time + edge_time
+                                    + lane_time) * 1000
+                index += 1
+
+    if len(sides) < 2:
+        errors[:, len(sides):] = -1  # Unlabeled sides are not scored
+    return errors, latencies
+
+
+def summarize_sweep(errors: np.ndarray, latencies: np.ndarray,
+                    grids: tuple[list[dict], ...],
+                    tolerance: float) -> list[dict]:
+    """Aggregate per-sample errors and latencies into a per-config report."""
+    labeled = errors != -1
+    detected = labeled & ~np.isnan(errors)
+    accurate = detected & (np.where(detected, errors, np.inf) <= tolerance)
+
+    accurate_count = accurate.sum(axis=(0, 2))
+    labeled_count = np.maximum(labeled.sum(axis=(0, 2)), 1)
+    detected_count = detected.sum(axis=(0, 2))
+    error_sum = np.where(detected, errors, 0).sum(axis=(0, 2))
+    mean_latency = latencies.mean(axis=0)
+
+    report = []
+    for index, params in enumerate(itertools.product(*grids)):
+        report.append({
+            "params": {key: value for stage in params
+                       for key, value in stage.items()},
+            "accuracy": float(accurate_count[index] / labeled_count[index]),
+            "mean_error": (float(error_sum[index] / detected_count[index])
+                           if detected_count[index] else None),
+            "latency_ms": float(mean_latency[index]),
+            "fps": float(1000 / mean_latency[index])
+        })
+    return report
+
+
+def pareto_frontier(report: list[dict]) -> list[dict]:
+    """Return the configs for which no other config is faster and better."""
+    frontier, best_accuracy = [], -1.0
+    for entry in sorted(report, key=lambda item: (-item["fps"],
+                                                  -item["accuracy"])):
+        if entry["accuracy"] > best_accuracy:
+            frontier.append(entry)
+            best_accuracy = entry["accuracy"]
+    return frontier
+
+
+def run_sweep(samples: dict[str, dict], config_params: tuple[dict, ...],
+              ranges: dict, workers: int | None = None,
+              tolerance: float = 10.0) -> list[dict]:
+    """
+    Evaluate a parameter sweep over labeled samples in parallel.
+
+    ``samples`` maps image paths to labeled ``left_line``/``right_line``
+    coordinates at the preprocessing resolution, in the same format as
+    the detection results.
+    """
+    grids = build_sweep(config_params, ranges)
+    configs = len(grids[0]) * len(grids[1]) * len(grids[2])
+    logging.info(f"Sweeping {configs} configs over {len(samples)} samples")
+
+    paths = list(samples)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        outputs = list(executor.map(
+            evaluate_sample, paths, [samples[path] for path in paths],
+            itertools.repeat(config_params), itertools.repeat(grids)))
+
+    errors = np.stack([output[0] for output in outputs])
+    latencies = np.stack([output[1] for output in outputs])
+    return summarize_sweep(errors, latencies, grids, tolerance)
+
+
+def load_samples(labels_path: str) -> dict[str, dict]:
+    """Load labeled samples, resolving image paths next to the labels file."""
+    with open(labels_path, "r") as file:
+        labels = json.load(file)
+
+    base_dir = os.path.dirname(os.path.abspath(labels_path))
+    return {os.path.join(base_dir, path): label
+            for path, label in labels.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sweep lane detection parameters over labeled samples.")
+    parser.add_argument("config_path")
+    parser.add_argument("labels_path")
+    parser.add_argument("ranges_path")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tolerance", type=float, default=10.0)
+    parser.add_argument("--output", default=None)
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(arguments.ranges_path, "r") as ranges_file:
+        sweep_ranges = json.load(ranges_file)
+
+    sweep_report = run_sweep(
+        load_samples(arguments.labels_path),
+        fetch_processing_params(ConfigManager(arguments.config_path)),
+        sweep_ranges, arguments.workers, arguments.tolerance)
+
+    for frontier_entry in pareto_frontier(sweep_report):
+        print(f"{frontier_entry['fps']:8.1f} fps  "
+              f"accuracy {frontier_entry['accuracy']:.2f}  "
+              f"{frontier_entry['params']}")
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(sweep_report, output_file, indent=2)
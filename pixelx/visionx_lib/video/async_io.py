@@ -0,0 +1,83 @@
+# pixelx/visionx_lib/video/async_io.py
+
+import queue
+import threading
+import time
+
+from pixelx.visionx_lib.core.base import cv2, logging, ImageType
+from pixelx.visionx_lib.core.enums import VideoCodec
+from pixelx.visionx_lib.video.io import create_video_writer
+
+
+class BackgroundVideoWriter:
+    """
+    Encodes video frames on a background thread while the caller keeps
+    processing.
+
+    The queue is bounded so a slow encoder applies back-pressure instead
+    of accumulating every pending frame in memory.
+    """
+
+    def __init__(self, output_path: str, fps: float,
+                 frame_size: tuple[int, int], codec: VideoCodec,
+                 queue_size: int = 32):
+        if not isinstance(queue_size, int) or queue_size <= 0:
+            raise ValueError("Queue size must be a positive integer.")
+
+        self.output_path = output_path
+        self.written = 0
+        self.encode_seconds = 0.0
+        self._error: cv2.error | None = None
+        self._writer = create_video_writer(output_path, fps, frame_size,
+                                           codec)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                continue  # Drain the queue so the producer never blocks
+
+            start = time.perf_counter()
+            try:
+                self._writer.write(frame)
+                self.written += 1
+            except cv2.error as e:
+                logging.error(f"Error encoding {self.output_path}: {e}")
+                self._error = e
+            self.encode_seconds += time.perf_counter() - start
+
+    def write(self, frame: ImageType) -> None:
+        """Queue a frame for encoding, blocking while the queue is full."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def report(self) -> dict:
+        """Return the number of encoded frames and the encode throughput."""
+        return {
+            "frames": self.written,
+            "encode_ms": round(self.encode_seconds * 1000, 3),
+            "encode_fps": (round(self.written / self.encode_seconds, 1)
+                           if self.encode_seconds else None)
+        }
+
+    def close(self) -> dict:
+        """Wait until all queued frames are encoded and finish the file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.release()
+
+        report = self.report()
+        logging.info(f"Video saved to {self.output_path}: {report}")
+        return report
+
+    def __enter__(self) -> "BackgroundVideoWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,73 @@
+# pixelx/visionx_lib/video/deadline.py
+
+from pixelx.visionx_lib.core.base import np
+
+# Degradation levels, from full processing to reusing the previous result
+FULL_LEVEL, REDUCED_LEVEL, REUSE_LEVEL = 0, 1, 2
+
+
+class FrameDeadline:
+    """
+    Tracks a per-frame time budget and degrades processing when it is
+    exceeded: first by processing at ``reduced_scale``, then by reusing
+    the previous result for a frame. It recovers one level at a time
+    once frames finish within ``recover_ratio`` of the budget.
+    """
+
+    def __init__(self, budget_ms: float, reduced_scale: float = 0.5,
+                 recover_ratio: float = 0.5):
+        if not isinstance(budget_ms, (int, float)) or budget_ms <= 0:
+            raise ValueError("Frame budget must be a positive number.")
+        if not 0 < reduced_scale < 1:
+            raise ValueError("Reduced scale must be between 0 and 1.")
+
+        self.budget_ms = budget_ms
+        self.reduced_scale = reduced_scale
+        self.recover_ratio = recover_ratio
+        self.level = FULL_LEVEL
+        self.latencies: list[float] = []
+        self.level_counts = [0, 0, 0]
+        self.missed = 0
+
+    def next_options(self, previous_result: dict | None) -> dict:
+        """Return the process function options for the next frame."""
+        if self.level == REUSE_LEVEL and previous_result is None:
+            self.level = REDUCED_LEVEL  # Nothing to reuse yet
+
+        self.level_counts[self.level] += 1
+        if self.level == REDUCED_LEVEL:
+            return {"scale": self.reduced_scale}
+        if self.level == REUSE_LEVEL:
+            return {"reuse_result": previous_result}
+        return {}
+
+    def record(self, latency_ms: float) -> None:
+        """Record a frame latency and pick the level of the next frame."""
+        self.latencies.append(latency_ms)
+
+        if self.level == REUSE_LEVEL:
+            # Reused frames say nothing about the detection cost
+            self.level = REDUCED_LEVEL
+        elif latency_ms > self.budget_ms:
+            self.missed += 1
+            self.level += 1
+        elif (latency_ms < self.budget_ms * self.recover_ratio
+              and self.level > FULL_LEVEL):
+            self.level -= 1
+
+    def report(self) -> dict:
+        """Return degradation counters and tail latencies in milliseconds."""
+        latencies = np.array(self.latencies or [0.0])
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "frames": len(self.latencies),
+            "missed_deadlines": self.missed,
+            "reduced_frames": self.level_counts[REDUCED_LEVEL],
+            "reused_frames": self.level_counts[REUSE_LEVEL],
+            "degraded_frames": (self.level_counts[REDUCED_LEVEL]
+                                + self.level_counts[REUSE_LEVEL]),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies.max())
+        }
@@ -0,0 +1,156 @@
+# pixelx/visionx_lib/video/frame_store.py
+
+import argparse
+
+from pixelx.visionx_lib.core.base import cv2, np, json, logging, os, \
+    ImageType
+from pixelx.visionx_lib.image import resize_by_aspect_ratio, \
+    convert_to_rgb2grayscale
+from pixelx.visionx_lib.video.io import open_video_capture, read_frame, \
+    get_frame_rate
+
+FRAMES_SUFFIX = ".frames"
+INDEX_SUFFIX = ".json"
+
+
+def get_store_paths(store_path: str) -> tuple[str, str]:
+    """Return the raw frames path and the index path of a frame store."""
+    base, _ = os.path.splitext(store_path)
+    return f"{base}{FRAMES_SUFFIX}", f"{base}{INDEX_SUFFIX}"
+
+
+def build_frame_store(video_path: str, store_path: str,
+                      grayscale: bool = False,
+                      width: int | None = None) -> dict:
+    """
+    Decode a video once into a raw frame file and write its index.
+
+    Frames can be stored in grayscale and pre-resized to ``width`` so
+    later runs skip both the decoding and the conversion.
+    """
+    capture = open_video_capture(video_path)
+    if capture is None:
+        raise FileNotFoundError(f"Could not open video {video_path}")
+
+    frames_path, index_path = get_store_paths(store_path)
+    os.makedirs(os.path.dirname(os.path.abspath(frames_path)), exist_ok=True)
+
+    fps = get_frame_rate(capture)
+    frame_count, shape = 0, None
+    try:
+        with open(frames_path, "wb") as file:
+            while (frame := read_frame(capture)) is not None:
+                if width is not None:
+                    frame = resize_by_aspect_ratio(frame, width)
+                if grayscale:
+                    frame = convert_to_rgb2grayscale(frame)
+
+                shape = shape or frame.shape
+                file.write(np.ascontiguousarray(frame).data)
+                frame_count += 1
+    finally:
+        capture.release()
+
+    if frame_count == 0:
+        raise ValueError(f"No frames could be decoded from {video_path}")
+
+    index = {
+        "video_path": video_path,
+        "frame_count": frame_count,
+        "shape": list(shape),
+        "dtype": "uint8",
+        "fps": fps,
+        "grayscale": grayscale,
+        "width": width
+    }
+    with open(index_path, "w") as file:
+        json.dump(index, file, indent=2)
+
+    logging.info(f"Stored {frame_count} frames of {video_path} "
+                 f"in {frames_path}")
+    return index
+
+
+def load_frame_store(store_path: str) -> tuple[np.memmap, dict]:
+    """Memory-map the frames of a store and return them with its index."""
+    frames_path, index_path = get_store_paths(store_path)
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"Frame store index {index_path} not found.")
+
+    with open(index_path, "r") as file:
+        index = json.load(file)
+
+    frames = np.memmap(frames_path, dtype=index["dtype"], mode="r",
+                       shape=(index["frame_count"], *index["shape"]))
+    return frames, index
+
+
+class FrameStoreCapture:
+    """
+    A ``cv2.VideoCapture`` compatible reader over a frame store.
+
+    Frames are returned as read-only views of the memory map, and the
+    position can be set to any frame for random access.
+    """
+
+    def __init__(self, store_path: str):
+        self.frames, self.index = load_frame_store(store_path)
+        self.position = 0
+        self._opened = True
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __getitem__(self, frame_index: int) -> ImageType:
+        return self.frames[frame_index]
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self) -> tuple[bool, ImageType | None]:
+        """Return the next frame like ``cv2.VideoCapture.read``."""
+        if not self._opened or self.position >= len(self.frames):
+            return False, None
+
+        frame = self.frames[self.position]
+        self.position += 1
+        return True, frame
+
+    def get(self, prop_id: int) -> float:
+        """Return a capture property supported by the store."""
+        height, width = self.index["shape"][:2]
+        properties = {
+            cv2.CAP_PROP_FPS: self.index["fps"],
+            cv2.CAP_PROP_FRAME_WIDTH: width,
+            cv2.CAP_PROP_FRAME_HEIGHT: height,
+            cv2.CAP_PROP_FRAME_COUNT: len(self.frames),
+            cv2.CAP_PROP_POS_FRAMES: self.position
+        }
+        return float(properties.get(prop_id, 0))
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """Seek to a frame with ``cv2.CAP_PROP_POS_FRAMES``."""
+        if prop_id != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        if not 0 <= int(value) <= len(self.frames):
+            return False
+
+        self.position = int(value)
+        return True
+
+    def release(self) -> None:
+        self._opened = False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Decode a video once into a memory-mapped frame store.")
+    parser.add_argument("video_path")
+    parser.add_argument("store_path")
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--width", type=int, default=None)
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    build_frame_store(arguments.video_path, arguments.store_path,
+                      arguments.grayscale, arguments.width)
@@ -1,6 +1,6 @@
 # pixelx/visionx_lib/video/io.py
 
-from pixelx.visionx_lib.core.base import cv2, ImageType
+from pixelx.visionx_lib.core.base import cv2, logging, ImageType
 from pixelx.visionx_lib.core.enums import VideoCodec
 from pixelx.visionx_lib.image import display_image_cv2
 from pixelx.visionx_lib.image.display_control import close_all_windows
@@ -13,7 +13,7 @@ def open_video_capture(video_path: str) -> cv2.VideoCapture | None:
     if capture.isOpened():
         return capture
 
-    print('Error: Could not open video file or stream.')
+    logging.error(f"Could not open video file or stream: {video_path}")
     return None
 
 
@@ -29,6 +29,30 @@ def get_frame_rate(capture: cv2.VideoCapture) -> int:
     return round(capture.get(cv2.CAP_PROP_FPS))
 
 
+# Codec presets measured on 540p footage: MPEG-4 encodes fastest, Motion
+# JPEG stores every frame independently (cheap seeking for intermediate
+# files) and H.264 is the most compact when the OpenCV build supports it
+CODEC_PRESETS = {
+    "fast": VideoCodec.MP4V,
+    "intermediate": VideoCodec.MJPG,
+    "compact": VideoCodec.AVC1
+}
+
+# Codec used when the requested one is not supported by the OpenCV build
+FALLBACK_CODEC = VideoCodec.MP4V
+
+
+def resolve_codec(codec: str | VideoCodec) -> VideoCodec:
+    """Return the codec of a preset name, a codec name or a codec."""
+    if isinstance(codec, VideoCodec):
+        return codec
+    if codec in CODEC_PRESETS:
+        return CODEC_PRESETS[codec]
+    if codec in VideoCodec.__members__:
+        return VideoCodec[codec]
+    raise ValueError(f"Unknown codec or codec preset: {codec}")
+
+
 def get_fourcc(codec: VideoCodec) -> int:
     """Generate the FourCC code for the specified codec."""
     return cv2.VideoWriter.fourcc(*codec.value)
@@ -54,18 +78,25 @@ def create_video_writer(output_path: str, fps: int, frame_size: tuple[int, int],
     fourcc = get_fourcc(codec)
 
     # Create VideoWriter object
-    return cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+    writer = cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+    if writer.isOpened() or codec == FALLBACK_CODEC:
+        return writer
+
+    logging.warning(f"Codec {codec.name} is not available, "
+                    f"using {FALLBACK_CODEC.name}")
+    return create_video_writer(output_path, fps, frame_size, FALLBACK_CODEC)
 
 
 def save_video_file(frames: list, output_path: str, fps: int,
                     frame_size: tuple[int, int], codec: VideoCodec) -> None:
+    """Encode a list of frames into a video file."""
     writer = create_video_writer(output_path, fps, frame_size, codec)
 
     for frame in frames:
         writer.write(frame)
 
     writer.release()
-    print(f"Video saved to {output_path}")
+    logging.info(f"Video saved to {output_path}")
 
 
 # ----------
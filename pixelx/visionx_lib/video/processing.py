@@ -1,7 +1,18 @@
 # pixelx/visionx_lib/video/procession.py
 
-from pixelx.visionx_lib.core.base import cv2, ImageType
+import inspect
+import math
+import time
+from collections import deque
+
+from pixelx.visionx_lib.core.base import cv2, ImageType, logging
+from pixelx.visionx_lib.core.metrics import MetricsRegistry, get_metrics, \
+    COUNT_BUCKETS
+from pixelx.visionx_lib.core.shared_frames import SharedFrameExecutor
 from pixelx.visionx_lib.image.display_control import handle_image_exit
+from pixelx.visionx_lib.image.pyramid import ImagePyramid
+from pixelx.visionx_lib.video.async_io import BackgroundVideoWriter
+from pixelx.visionx_lib.video.deadline import FrameDeadline
 from pixelx.visionx_lib.video.io import get_frame_rate, read_frame, \
     display_frame, release_video_capture
 
@@ -16,36 +27,385 @@ def is_frame_processable(frame_count: int, skip_interval: int) -> bool:
     return (frame_count % skip_interval) == 0
 
 
-def store_frame(frame, processed, processed_frames) -> None:
-    """Stores a frame into the processed frames list."""
-    processed_frames.append(frame if processed is None else processed)
+def accepts_option(function: callable, name: str) -> bool:
+    """Return whether a function accepts the given keyword option."""
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(parameter.name == name
+               or parameter.kind is inspect.Parameter.VAR_KEYWORD
+               for parameter in parameters)
+
+
+def downsample_frame(frame: ImageType | ImagePyramid,
+                     width: int = 64) -> ImageType:
+    """Return a tiny grayscale version of a frame for cheap comparisons."""
+    return ImagePyramid.wrap(frame).grayscale(
+        width, interpolation=cv2.INTER_NEAREST)
+
+
+def compute_motion_score(small_frame: ImageType,
+                         reference: ImageType | None) -> float:
+    """Return the mean absolute difference of two tiny frames in [0, 1]."""
+    if reference is None:
+        return 1.0
+    return float(cv2.absdiff(small_frame, reference).mean()) / 255
+
+
+class AdaptiveFrameScheduler:
+    """
+    Decides which frames get full detection from the measured processing
+    cost and the scene motion, instead of a fixed skip interval.
+
+    Frames are never processed more often than the CPU budget allows
+    (``cpu_budget`` is the fraction of real time spent on detection) or
+    than ``target_fps``. Within that limit, frames that moved by at least
+    ``motion_threshold`` are processed, while static scenes are only
+    refreshed every ``max_interval`` frames.
+    """
+
+    def __init__(self, fps: int, target_fps: float | None = None,
+                 cpu_budget: float = 1.0, motion_threshold: float = 0.02,
+                 max_interval: int | None = None, smoothing: float = 0.2):
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("CPU budget must be in (0, 1].")
+
+        self.fps = max(1, fps)
+        self.rate_interval = (max(1, round(self.fps / target_fps))
+                              if target_fps else 1)
+        self.cpu_budget = cpu_budget
+        self.motion_threshold = motion_threshold
+        self.max_interval = max_interval or self.fps
+        self.smoothing = smoothing
+        self.average_cost_ms: float | None = None
+        self.frames_since_processed = math.inf
+        self.reference: ImageType | None = None
+        self.processed = 0
+        self.skipped = 0
+
+    @property
+    def min_interval(self) -> int:
+        """Return the smallest interval allowed by the cost and rate limits."""
+        if self.average_cost_ms is None:
+            return self.rate_interval
+
+        cost_interval = math.ceil(
+            self.average_cost_ms * self.fps / (1000 * self.cpu_budget))
+        return max(self.rate_interval, cost_interval)
+
+    def should_process(self, frame: ImageType | ImagePyramid) -> bool:
+        """Return whether the frame should get full detection."""
+        self.frames_since_processed += 1
+        if self.frames_since_processed < self.min_interval:
+            self.skipped += 1
+            return False
+
+        small_frame = downsample_frame(frame)
+        motion = compute_motion_score(small_frame, self.reference)
+        if (motion < self.motion_threshold
+                and self.frames_since_processed < self.max_interval):
+            self.skipped += 1
+            return False
+
+        self.reference = small_frame
+        self.frames_since_processed = 0
+        self.processed += 1
+        return True
+
+    def record(self, processing_ms: float) -> None:
+        """Update the smoothed processing cost with a new measurement."""
+        if self.average_cost_ms is None:
+            self.average_cost_ms = processing_ms
+        else:
+            self.average_cost_ms += self.smoothing * (
+                processing_ms - self.average_cost_ms)
+
+    def report(self) -> dict:
+        """Return how many frames were processed and skipped."""
+        return {
+            "processed_frames": self.processed,
+            "skipped_frames": self.skipped,
+            "average_cost_ms": self.average_cost_ms,
+            "min_interval": self.min_interval
+        }
+
+
+class FrameChangeDetector:
+    """
+    Detects when a frame barely differs from the last frame that got full
+    detection, so its result can be reused instead.
+
+    Frames are compared as tiny grayscale versions; a mean absolute
+    difference below ``threshold`` counts as unchanged. Detection is
+    forced after ``max_reused`` consecutive reuses so slow drifts are
+    still picked up. Frames that do get detection must be passed to
+    ``mark_detected`` to become the new reference.
+    """
+
+    def __init__(self, threshold: float = 0.01, max_reused: int = 30,
+                 width: int = 64):
+        if not 0 <= threshold <= 1:
+            raise ValueError("Change threshold must be in [0, 1].")
+        if not isinstance(max_reused, int) or max_reused < 0:
+            raise ValueError("Max reused must be a non-negative integer.")
+
+        self.threshold = threshold
+        self.max_reused = max_reused
+        self.width = width
+        self.reference: ImageType | None = None
+        self.consecutive_reused = 0
+        self.detected = 0
+        self.reused = 0
+
+    def is_unchanged(self, frame: ImageType | ImagePyramid) -> bool:
+        """Return whether the previous result can be reused for the frame."""
+        if (self.consecutive_reused < self.max_reused
+                and compute_motion_score(downsample_frame(frame, self.width),
+                                         self.reference) < self.threshold):
+            self.consecutive_reused += 1
+            self.reused += 1
+            return True
+        return False
+
+    def mark_detected(self, frame: ImageType | ImagePyramid) -> None:
+        """Make a frame that got full detection the new reference."""
+        self.reference = downsample_frame(frame, self.width)
+        self.consecutive_reused = 0
+        self.detected += 1
+
+    def report(self) -> dict:
+        """Return how many frames were detected and short-circuited."""
+        checked = self.detected + self.reused
+        return {
+            "checked_frames": checked,
+            "detected_frames": self.detected,
+            "reused_frames": self.reused,
+            "reuse_ratio": round(self.reused / checked, 3) if checked else 0.0
+        }
+
+
+def count_frame(metrics: MetricsRegistry | None, event: str) -> None:
+    """Count a decoded, processed, reused, skipped or dropped frame."""
+    if metrics is not None:
+        metrics.increment(f"lane_frames_{event}_total")
+
+
+def record_result_metrics(metrics: MetricsRegistry | None,
+                          result: dict) -> None:
+    """
+    Record the stage latencies, the number of segments and the fit
+    failures of a detection result.
+    """
+    if metrics is None:
+        return
+
+    count_frame(metrics, "processed")
+    for stage, milliseconds in result.get("timings", {}).items():
+        metrics.observe("lane_stage_latency_ms", milliseconds, stage=stage)
+
+    if "segments" in result:
+        metrics.observe("lane_hough_segments", result["segments"],
+                        COUNT_BUCKETS)
+    for side in ("left", "right"):
+        if f"{side}_line" in result and result[f"{side}_line"] is None:
+            metrics.increment("lane_fit_failures_total", side=side)
+
+
+def store_frame(frame, processed, processed_frames,
+                writer: BackgroundVideoWriter | None = None,
+                processed_only: bool = False,
+                metrics: MetricsRegistry | None = None) -> None:
+    """
+    Stores a frame into the processed frames list, or queues it on the
+    writer if one is given. Unprocessed frames are dropped if
+    ``processed_only``.
+    """
+    if processed is None and processed_only:
+        count_frame(metrics, "dropped")
+        return
+
+    output_frame = frame if processed is None else processed
+    if writer is None:
+        processed_frames.append(output_frame)
+    else:
+        writer.write(output_frame)
+
+
+def process_video_pooled(capture: cv2.VideoCapture,
+                         process_function: callable,
+                         config_params: tuple[dict, ...],
+                         executor: SharedFrameExecutor,
+                         skip_interval: int, results: list | None = None,
+                         detect_only: bool = False,
+                         writer: BackgroundVideoWriter | None = None,
+                         processed_only: bool = False) -> list:
+    """
+    Process the frames of a video on a shared memory process pool,
+    keeping the output frames and the results in frame order.
+    """
+    processed_frames: list[ImageType] = []
+    pending = deque()  # (frame index, frame, future or None)
+    in_flight = 0
+    metrics = get_metrics()
+
+    def collect_oldest():
+        nonlocal in_flight
+        frame_index, frame, future = pending.popleft()
+        processed_frame = None
+        if future is not None:
+            in_flight -= 1
+            processed_frame, result = executor.collect(future)
+            record_result_metrics(metrics, result)
+            if results is not None:
+                results.append({"frame": frame_index, **result})
+        else:
+            count_frame(metrics, "skipped")
+        if not detect_only:
+            store_frame(frame, processed_frame, processed_frames, writer,
+                        processed_only, metrics)
+
+    frame_count = 0
+    while capture.isOpened():
+        frame = read_frame(capture)
+        if frame is None:
+            break
+        count_frame(metrics, "decoded")
+
+        future = None
+        if is_frame_processable(frame_count, skip_interval):
+            while in_flight == executor.slots:
+                collect_oldest()
+            future = executor.submit(process_function, frame, config_params)
+            in_flight += 1
+        pending.append((frame_count, None if detect_only else frame, future))
+        frame_count += 1
+
+    while pending:
+        collect_oldest()
+    return processed_frames
 
 
 def process_video(capture: cv2.VideoCapture, process_function: callable,
                   config_params: tuple[dict, ...], processing_rate: int = 10,
-                  display: bool = False) -> list:
-    """Process a video stream using a custom frame processing function."""
+                  display: bool = False, results: list | None = None,
+                  detect_only: bool = False,
+                  deadline: FrameDeadline | None = None,
+                  scheduler: AdaptiveFrameScheduler | None = None,
+                  executor: SharedFrameExecutor | None = None,
+                  writer: BackgroundVideoWriter | None = None,
+                  processed_only: bool = False,
+                  change_detector: FrameChangeDetector | None = None
+                  ) -> list:
+    """
+    Process a video stream using a custom frame processing function.
+
+    The function returns the processed frame and its result; when a
+    ``results`` list is given, each result is tagged with its frame index
+    and appended to it. In ``detect_only`` mode no frames are kept or
+    displayed and only the results are collected.
+
+    When the function accepts a ``pyramid`` option, it receives an
+    ``ImagePyramid`` of the frame, shared with the scheduler and the
+    change detector; ``process_function(frame, config_params)`` is
+    enough otherwise. With a ``deadline``, it also receives the ``scale``
+    or ``reuse_result`` options of the current degradation level. A ``scheduler`` replaces the fixed
+    ``processing_rate`` skip interval. A ``change_detector`` makes frames
+    that barely changed since the last detection reuse its result.
+
+    With an ``executor``, frames are processed concurrently on its process
+    pool through shared memory; this cannot be combined with a deadline,
+    a scheduler, a change detector or the display, which need each
+    result before the next frame.
+
+    With a ``writer``, frames are encoded in the background as they are
+    produced instead of being returned. With ``processed_only``, frames
+    that were not processed are left out of the output; the scheduler
+    would make their rate vary, so it cannot be used.
+
+    Errors are logged and no frames are returned, unless a ``writer`` or
+    a ``results`` list is given: their outputs would be incomplete, so
+    the error is raised.
+
+    Frame counts, stage latencies, segment counts and fit failures are
+    recorded when metrics are enabled (see ``core.metrics``).
+    """
+    if executor is not None and (deadline or scheduler or change_detector
+                                 or display):
+        raise ValueError("A frame executor cannot be combined with a "
+                         "deadline, a scheduler, a change detector or "
+                         "the display.")
+    if processed_only and scheduler is not None:
+        raise ValueError("Keeping only processed frames cannot be combined "
+                         "with a scheduler.")
 
     try:
         fps = get_frame_rate(capture)
         skip_interval = get_frame_skip_interval(fps, processing_rate)
+        if executor is not None:
+            return process_video_pooled(capture, process_function,
+                                        config_params, executor,
+                                        skip_interval, results, detect_only,
+                                        writer, processed_only)
+
         frame_count: int = 0
         processed_frames: list[ImageType] = []
+        previous_result: dict | None = None
+        pass_pyramid = accepts_option(process_function, "pyramid")
+        metrics = get_metrics()
 
         while capture.isOpened():
             frame = read_frame(capture)
 
             if frame is None:
-                print('Video capture failed or end of video reached')
+                logging.info("Video capture failed or end of video reached")
                 break
+            count_frame(metrics, "decoded")
 
             # Determine if this frame needs processing
             processed_frame = None
-            if is_frame_processable(frame_count, skip_interval):
-                processed_frame, mask_lane = process_function(frame,
-                                                              config_params)
+            pyramid = ImagePyramid(frame)
+            if (scheduler.should_process(pyramid) if scheduler is not None
+                    else is_frame_processable(frame_count, skip_interval)):
+                # Unchanged scenes reuse the result without counting
+                # towards the deadline or the scheduler cost
+                unchanged = (change_detector is not None
+                             and change_detector.is_unchanged(pyramid))
+                if unchanged:
+                    options = {"reuse_result": previous_result}
+                else:
+                    options = ({} if deadline is None
+                               else deadline.next_options(previous_result))
+                if pass_pyramid:
+                    options["pyramid"] = pyramid
+                start = time.perf_counter()
+                processed_frame, result = process_function(
+                    frame, config_params, **options)
+                latency_ms = (time.perf_counter() - start) * 1000
+                if deadline is not None and not unchanged:
+                    deadline.record(latency_ms)
+                if scheduler is not None and not unchanged:
+                    scheduler.record(latency_ms)
+                if (change_detector is not None
+                        and "reuse_result" not in options):
+                    change_detector.mark_detected(pyramid)
 
-            store_frame(frame, processed_frame, processed_frames)
+                previous_result = result
+                if "reuse_result" in options:
+                    count_frame(metrics, "reused")
+                else:
+                    record_result_metrics(metrics, result)
+                if results is not None:
+                    results.append({"frame": frame_count, **result})
+            else:
+                count_frame(metrics, "skipped")
+
+            if detect_only:
+                frame_count += 1
+                continue
+
+            store_frame(frame, processed_frame, processed_frames, writer,
+                        processed_only, metrics)
 
             if display:
                 display_frame(frame, processed_frame)
@@ -54,9 +414,18 @@ def process_video(capture: cv2.VideoCapture, process_function: callable,
                 if handle_image_exit(fps): break
 
             frame_count += 1
+
+        if deadline is not None:
+            logging.info(f"Frame deadline report: {deadline.report()}")
+        if scheduler is not None:
+            logging.info(f"Frame scheduler report: {scheduler.report()}")
+        if change_detector is not None:
+            logging.info(f"Frame change report: {change_detector.report()}")
         return processed_frames
     except Exception as e:
-        print(f"Error during video processing: {e}")
+        logging.error(f"Error during video processing: {e}")
+        if writer is not None or results is not None:
+            raise  # Partial outputs must not pass for complete ones
         return []
 
     finally: